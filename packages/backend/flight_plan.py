@@ -9,15 +9,32 @@ import pprint
 import logging
 import os
 import json
-from pydantic import BaseModel, Field, model_validator
-from typing import Any, List, Tuple, Optional
+import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from typing import Any, Dict, List, Tuple, Optional
 from pyproj import Transformer
+from pyproj.enums import TransformDirection
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Set up logger (logging configuration is handled centrally in main.py)
 logger = logging.getLogger(__name__)
 
 THEATRES_DIR = os.path.join(os.path.dirname(__file__), "theatres")
 
+
+def _jit(func):
+    """Compile func with numba when it is installed, otherwise run it as plain Python."""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
 class RegimeCruise(BaseModel):
     tas: float = Field(..., gt=0, description="Cruise TAS (knots)")
     ff: float = Field(..., gt=0, description="Cruise fuel flow (pph)")
@@ -64,6 +81,8 @@ def default_aircraft() -> Aircraft:
 
 class FlightPlanTurnPoint(BaseModel):
     """Represents a single turn point in a flight plan."""
+    model_config = ConfigDict(frozen=True)
+
     lat: float = Field(..., ge=-90, le=90, description="Latitude (-90 to 90)")
     lon: float = Field(..., ge=-180, le=180, description="Longitude (-180 to 180)")
     tas: float = Field(..., ge=0, description="True Air Speed into this TP")
@@ -108,8 +127,23 @@ class PlanMarker(BaseModel):
     comment: Optional[str] = None
 
 
+class _DerivedCache(dict):
+    """Per-instance cache of values derived from the fields of a frozen model.
+
+    Never part of the model equality: two plans with the same fields are
+    equal whether or not their caches have been filled.
+    """
+    __slots__ = ()
+    __hash__ = None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _DerivedCache)
+
+
 class FlightPlan(BaseModel):
     """Represents a complete flight plan with waypoints and initial conditions."""
+    model_config = ConfigDict(frozen=True)
+
     theatre: str = Field(..., description="Theatre name")
     points: List[FlightPlanTurnPoint]
     aircraft: Aircraft = Field(default_factory=default_aircraft, description="Aircraft performance data")
@@ -121,6 +155,28 @@ class FlightPlan(BaseModel):
     libraryRefs: Optional[List[PlanLibraryRef]] = Field(default=None)
     markers: Optional[List[PlanMarker]] = Field(default=None)
     librarySnapshot: Optional[List[LibraryObject]] = Field(default=None)
+    _derived: _DerivedCache = PrivateAttr(default_factory=_DerivedCache)
+
+    def as_soa(self) -> dict:
+        """Numeric turnpoint fields as read-only parallel float64 arrays, keyed by field name.
+
+        Built on first use and cached on the (frozen) plan.
+        """
+        soa = self._derived.get('soa')
+        if soa is None:
+            soa = self._derived['soa'] = _points_to_soa(self)
+        return soa
+
+    def __copy__(self) -> 'FlightPlan':
+        # model_copy(update=...) may change the fields: never share the derived values
+        copy = super().__copy__()
+        copy._derived = _DerivedCache()
+        return copy
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> 'FlightPlan':
+        copy = super().__deepcopy__(memo)
+        copy._derived = _DerivedCache()
+        return copy
 
     @model_validator(mode='before')
     @classmethod
@@ -146,6 +202,7 @@ def get_effective_exit_time(exit_time_sec: int | None, eta: int) -> int:
 
 class TurnpointData:
     """Represent a turnpoint with all the data to display."""
+    __slots__ = ('etaSec', 'efr', 'hackEtaSec', 'exitTimeSec')
     etaSec: int
     efr: float
     hackEtaSec: int | None
@@ -160,6 +217,7 @@ class TurnpointData:
 
 class Point:
     """Represent a point in latitude and longitude."""
+    __slots__ = ('lat', 'lon')
     lat: float
     lon: float
 
@@ -172,6 +230,7 @@ class Point:
 
 class TurnData:
     """Represent the data for initial the turn. (to help drawing)."""
+    __slots__ = ('center',)
     center: Point
 
     def __init__(self, center_lat: float, center_lon: float):
@@ -187,11 +246,15 @@ def _load_theatre_config(theatre: str) -> dict:
         return json.load(f)
 
 
-def _create_transformer(theatre_config: dict) -> Transformer:
-    """Create a pyproj Transformer from theatre configuration."""
-    projection = theatre_config.get("projection", "transverse_mercator")
-    central_meridian = theatre_config.get("central_meridian", 39)
+@lru_cache(maxsize=None)
+def _cached_transformer(projection: str, central_meridian: float) -> Transformer:
+    """
+    Build the WGS84 -> map Transformer once per (projection, central meridian).
 
+    The Transformer is shared between threads (request handlers, kneeboard
+    worker); since pyproj 3.1 it keeps one PROJ object per thread internally,
+    so concurrent use is safe without a per-thread cache here.
+    """
     if projection == "transverse_mercator":
         return Transformer.from_crs(
             "EPSG:4326",
@@ -208,6 +271,13 @@ def _create_transformer(theatre_config: dict) -> Transformer:
         raise ValueError(f"Unsupported projection: {projection}")
 
 
+def _create_transformer(theatre_config: dict) -> Transformer:
+    """Return the (cached) pyproj Transformer for the theatre configuration."""
+    projection = theatre_config.get("projection", "transverse_mercator")
+    central_meridian = theatre_config.get("central_meridian", 39)
+    return _cached_transformer(projection, central_meridian)
+
+
 def _project(transformer: Transformer, lat: float, lon: float) -> Tuple[float, float]:
     """Project lat/lon to map coordinates using the given transformer."""
     x, y = transformer.transform(lon, lat)
@@ -216,16 +286,17 @@ def _project(transformer: Transformer, lat: float, lon: float) -> Tuple[float, f
 
 def _unproject(transformer: Transformer, x: float, y: float) -> Tuple[float, float]:
     """Unproject map coordinates to lat/lon. Returns (lat, lon)."""
-    # Create inverse transformer
-    inv = Transformer.from_crs(
-        transformer.target_crs,
-        transformer.source_crs,
-        always_xy=True
-    )
-    lon, lat = inv.transform(x, y)
+    # Run the same pipeline backwards instead of building an inverse transformer
+    lon, lat = transformer.transform(x, y, direction=TransformDirection.INVERSE)
     return lat, lon
 
 
+def _unproject_many(transformer: Transformer, xs, ys) -> Tuple[list, list]:
+    """Unproject several map coordinates in a single PROJ call. Returns (lats, lons)."""
+    lons, lats = transformer.transform(xs, ys, direction=TransformDirection.INVERSE)
+    return list(lats), list(lons)
+
+
 def calculate_bearing(point1: Point, point2: Point, navigation_mode: str = "geographic", transformer: Transformer = None) -> float:
     """Calculate the bearing between two points in degrees (0-360).
     In 'projected' mode, uses atan2 on projected coordinates.
@@ -265,10 +336,102 @@ def calculate_distance(point1: Point, point2: Point, navigation_mode: str = "geo
     d_lat = lat2_rad - lat1_rad
     d_lon = lon2_rad - lon1_rad
     a = math.sin(d_lat/2) * math.sin(d_lat/2) + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(d_lon/2) * math.sin(d_lon/2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    c = 2 * math.asin(math.sqrt(min(1.0, a)))
     return R * c
 
 
+@dataclass(slots=True)
+class _PointCache:
+    """Radians and latitude sin/cos of a point, computed once and shared by the leg helpers."""
+    lat_r: float
+    lon_r: float
+    sin_lat: float
+    cos_lat: float
+
+    @classmethod
+    def from_lat_lon(cls, lat: float, lon: float) -> "_PointCache":
+        lat_r = math.radians(lat)
+        return cls(lat_r, math.radians(lon), math.sin(lat_r), math.cos(lat_r))
+
+
+def _point_caches(lat: np.ndarray, lon: np.ndarray) -> List[_PointCache]:
+    """Build the _PointCache of every waypoint with the trig evaluated array-wide."""
+    lat_r = np.radians(lat)
+    lon_r = np.radians(lon)
+    return [
+        _PointCache(*fields)
+        for fields in zip(lat_r.tolist(), lon_r.tolist(), np.sin(lat_r).tolist(), np.cos(lat_r).tolist())
+    ]
+
+
+def _bearing_cached(a: _PointCache, b: _PointCache) -> float:
+    """Geographic bearing (0-360) between two cached points, see calculate_bearing."""
+    dLon = b.lon_r - a.lon_r
+    y = math.sin(dLon) * b.cos_lat
+    x = a.cos_lat * b.sin_lat - a.sin_lat * b.cos_lat * math.cos(dLon)
+    return (math.degrees(math.atan2(y, x)) + 360) % 360
+
+
+def _bearing_and_distance(a: _PointCache, b: _PointCache) -> Tuple[float, float]:
+    """Geographic bearing (0-360) and Haversine distance (meters) between two cached points.
+
+    Fused version of calculate_bearing + calculate_distance sharing the
+    longitude difference and the latitude sin/cos.
+    """
+    R = 6371000  # Earth's radius in meters
+    d_lat = b.lat_r - a.lat_r
+    d_lon = b.lon_r - a.lon_r
+    y = math.sin(d_lon) * b.cos_lat
+    x = a.cos_lat * b.sin_lat - a.sin_lat * b.cos_lat * math.cos(d_lon)
+    bearing = (math.degrees(math.atan2(y, x)) + 360) % 360
+    sin_half_dlat = math.sin(d_lat/2)
+    sin_half_dlon = math.sin(d_lon/2)
+    a_hav = sin_half_dlat * sin_half_dlat + a.cos_lat * b.cos_lat * sin_half_dlon * sin_half_dlon
+    c = 2 * math.asin(math.sqrt(min(1.0, a_hav)))
+    return bearing, R * c
+
+
+_SOA_FIELDS = ('lat', 'lon', 'tas', 'alt', 'fuelFlow', 'windSpeed', 'windDir')
+
+
+def _points_to_soa(flightPlan: FlightPlan) -> dict:
+    """Extract the numeric turnpoint fields into parallel float64 arrays (structure of arrays).
+
+    The validated models are read in a single pass; the rest of the plan
+    computation then works on plain arrays instead of model attributes.
+    Prefer FlightPlan.as_soa(), which caches the result.
+    """
+    rows = [[getattr(p, attr) for attr in _SOA_FIELDS] for p in flightPlan.points]
+    # (n, 7) rows transposed into one contiguous (7, n) block, one row per field
+    table = np.array(rows, dtype=np.float64).reshape(len(rows), len(_SOA_FIELDS)).T.copy()
+    # Shared through the cache, so make sure nobody modifies it in place
+    table.flags.writeable = False
+    return {attr: table[i] for i, attr in enumerate(_SOA_FIELDS)}
+
+
+def _great_circle_legs(lat: np.ndarray, lon: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized bearing (degrees, 0-360) and Haversine distance (meters) between consecutive points.
+
+    Same formulas as calculate_bearing / calculate_distance in 'geographic' mode,
+    evaluated for all the legs of the plan at once.
+    """
+    R = 6371000  # Earth's radius in meters
+    # Contiguous float64 so the ufuncs take numpy's SIMD loops
+    lat_r = np.radians(np.ascontiguousarray(lat, dtype=np.float64))
+    lon_r = np.radians(np.ascontiguousarray(lon, dtype=np.float64))
+    lat1, lat2 = lat_r[:-1], lat_r[1:]
+    d_lat = np.diff(lat_r)
+    d_lon = np.diff(lon_r)
+
+    y = np.sin(d_lon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(d_lon)
+    bearing = (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+    a = np.sin(d_lat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(d_lon / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(np.minimum(1.0, a)))
+    return bearing, R * c
+
+
 def calculate_straigthening_point(inbound_bearing: float, point1: Point, point2: Point, turn_radius_m: float, transformer: Transformer = None, navigation_mode: str = "geographic") -> Tuple[TurnData, float, float]:
     """Calculate the straigthening point (point where the turn is finished)."""
 
@@ -280,25 +443,35 @@ def calculate_straigthening_point(inbound_bearing: float, point1: Point, point2:
     else:
         aprox_outbound_bearing = calculate_bearing(point1, point2)
 
-    logger.info(f"Start point: {sx}, {sy}")
+    _, cx, cy, sx_result, sy_result = _straigthening_point_xy(inbound_bearing, aprox_outbound_bearing, sx, sy, dx, dy, turn_radius_m)
 
-    # Calculate the turning circle
-    if (aprox_outbound_bearing - inbound_bearing + 360) % 360 > 180:
-        # Left turn (direct)
-        logger.info(f"Left turn")
-        turn_direction = 1
-    else:
-        # Right turn (reverse)
-        logger.info(f"Right turn")
-        turn_direction = -1
+    (c_lat, s_lat), (c_lon, s_lon) = _unproject_many(transformer, [cx, sx_result], [cy, sy_result])
+    return TurnData(c_lat, c_lon), s_lat, s_lon
+
+
+# Outcome codes of _turn_geometry_kernel
+_TURN_ROOT_1 = 1            # First intersection, on the outbound side of the circle
+_TURN_ROOT_2 = 2            # Second intersection, on the outbound side of the circle
+_TURN_ROOT_1_FALLBACK = 3   # Both intersections behind, first one is the least bad
+_TURN_ROOT_2_FALLBACK = 4   # Both intersections behind, second one is the least bad
+_TURN_HORIZONTAL = 5        # Radical axis parallel to the x axis
+_TURN_DEGENERATE = -1       # Destination on the circle centre
+_TURN_NO_INTERSECTION = -2  # Destination inside the turning circle
+
+
+@_jit
+def _turn_geometry_kernel(inbound_bearing, aprox_outbound_bearing, sx, sy, dx, dy, turn_radius_m):
+    """Numeric core of the straigthening point computation (numba-compiled when available).
+
+    Only scalar math, so that it can be compiled to native code. Returns
+    (turn_direction, cx, cy, sx_result, sy_result, status, discriminant, dot1, dot2)
+    where status is one of the _TURN_* codes.
+    """
+    # Calculate the turning circle: 1 = left turn (direct), -1 = right turn (reverse)
+    turn_direction = 2 * ((aprox_outbound_bearing - inbound_bearing + 360) % 360 > 180) - 1
 
     cx = sx - turn_direction * math.cos(math.radians(inbound_bearing)) * turn_radius_m
     cy = sy + turn_direction * math.sin(math.radians(inbound_bearing)) * turn_radius_m
-    c_lat, c_lon = _unproject(transformer, cx, cy)
-    turn_data = TurnData(c_lat, c_lon)
-
-    logger.info(f"Centre of the turning circle: {cx}, {cy}")
-    logger.info(f"Destination point: {dx}, {dy}")
 
     # Calculate the coefs for the equation of the radical axis line
     # Line equation: Ax + By = C
@@ -306,87 +479,100 @@ def calculate_straigthening_point(inbound_bearing: float, point1: Point, point2:
     B = cy - dy
     C = (cx**2 + cy**2 - turn_radius_m**2) - (dx * cx + dy * cy)
 
-    logger.info(f"Radical axis line: A={A:.2f}, B={B:.2f}, C={C:.2f}")
-
     # Handle edge case: if B = 0, the line is horizontal (y = constant)
     if abs(B) < 1e-10:
         if abs(A) < 1e-10:
-            raise ValueError("Line is degenerate (both A and B are zero)")
+            return turn_direction, cx, cy, 0.0, 0.0, _TURN_DEGENERATE, 0.0, 0.0, 0.0
         x_line = C / A
         discriminant = turn_radius_m**2 - (x_line - cx)**2
         if discriminant < 0:
-            raise ValueError(f"No intersection: line too far from circle (discriminant={discriminant})")
+            return turn_direction, cx, cy, 0.0, 0.0, _TURN_NO_INTERSECTION, discriminant, 0.0, 0.0
         sqrt_disc = math.sqrt(discriminant)
-        sy_result = cy + turn_direction * sqrt_disc
-        sx_result = x_line
-        logger.info(f"Edge case: horizontal line, sx_result={sx_result:.2f}, sy_result={sy_result:.2f}")
-    else:
-        a = A**2 + B**2
-        b = -2 * B**2 * cx + 2 * A * (B * cy - C)
-        c = B**2 * cx**2 + (C - B * cy)**2 - turn_radius_m**2 * B**2
+        return turn_direction, cx, cy, x_line, cy + turn_direction * sqrt_disc, _TURN_HORIZONTAL, discriminant, 0.0, 0.0
 
-        logger.info(f"Quadratic coefficients: a={a:.2f}, b={b:.2f}, c={c:.2f}")
+    a = A**2 + B**2
+    b = -2 * B**2 * cx + 2 * A * (B * cy - C)
+    c = B**2 * cx**2 + (C - B * cy)**2 - turn_radius_m**2 * B**2
 
-        discriminant = b**2 - 4 * a * c
-        logger.info(f"Discriminant: {discriminant:.2f}")
-        if discriminant < 0:
-            raise ValueError(f"No intersection: line does not intersect circle (discriminant={discriminant})")
+    discriminant = b**2 - 4 * a * c
+    if discriminant < 0:
+        return turn_direction, cx, cy, 0.0, 0.0, _TURN_NO_INTERSECTION, discriminant, 0.0, 0.0
 
-        sqrt_disc = math.sqrt(discriminant)
+    sqrt_disc = math.sqrt(discriminant)
 
-        x1_intersect = (-b + sqrt_disc) / (2 * a)
-        y1_intersect = (C - A * x1_intersect) / B
-        x2_intersect = (-b - sqrt_disc) / (2 * a)
-        y2_intersect = (C - A * x2_intersect) / B
-
-        # Select the correct intersection point based on smooth transition criterion
-        radius1_x = x1_intersect - cx
-        radius1_y = y1_intersect - cy
-        if turn_direction == 1:
-            tangent1_x = -radius1_y
-            tangent1_y = radius1_x
-        else:
-            tangent1_x = radius1_y
-            tangent1_y = -radius1_x
-        dir1_x = dx - x1_intersect
-        dir1_y = dy - y1_intersect
-        dot1 = tangent1_x * dir1_x + tangent1_y * dir1_y
-
-        radius2_x = x2_intersect - cx
-        radius2_y = y2_intersect - cy
-        if turn_direction == 1:
-            tangent2_x = -radius2_y
-            tangent2_y = radius2_x
-        else:
-            tangent2_x = radius2_y
-            tangent2_y = -radius2_x
-        dir2_x = dx - x2_intersect
-        dir2_y = dy - y2_intersect
-        dot2 = tangent2_x * dir2_x + tangent2_y * dir2_y
-
-        logger.debug(f"Intersection point 1: ({x1_intersect:.2f}, {y1_intersect:.2f}), dot product: {dot1:.2f}")
-        logger.debug(f"Intersection point 2: ({x2_intersect:.2f}, {y2_intersect:.2f}), dot product: {dot2:.2f}")
-
-        if dot1 > 0:
-            sx_result = x1_intersect
-            sy_result = y1_intersect
-            logger.debug(f"Selected intersection point 1 (dot={dot1:.2f})")
-        elif dot2 > 0:
-            sx_result = x2_intersect
-            sy_result = y2_intersect
-            logger.debug(f"Selected intersection point 2 (dot={dot2:.2f})")
-        else:
-            if dot1 > dot2:
-                sx_result = x1_intersect
-                sy_result = y1_intersect
-                logger.warning(f"Both dot products negative, selected point 1 (dot={dot1:.2f} vs {dot2:.2f})")
-            else:
-                sx_result = x2_intersect
-                sy_result = y2_intersect
-                logger.warning(f"Both dot products negative, selected point 2 (dot={dot2:.2f} vs {dot1:.2f})")
+    x1_intersect = (-b + sqrt_disc) / (2 * a)
+    y1_intersect = (C - A * x1_intersect) / B
+    x2_intersect = (-b - sqrt_disc) / (2 * a)
+    y2_intersect = (C - A * x2_intersect) / B
+
+    # Select the correct intersection point based on smooth transition criterion:
+    # the tangent of the circle in the turn direction, turn_direction * (-ry, rx),
+    # must point towards the destination.
+    dot1 = turn_direction * ((x1_intersect - cx) * (dy - y1_intersect) - (y1_intersect - cy) * (dx - x1_intersect))
+    dot2 = turn_direction * ((x2_intersect - cx) * (dy - y2_intersect) - (y2_intersect - cy) * (dx - x2_intersect))
+
+    if dot1 > 0:
+        return turn_direction, cx, cy, x1_intersect, y1_intersect, _TURN_ROOT_1, discriminant, dot1, dot2
+    if dot2 > 0:
+        return turn_direction, cx, cy, x2_intersect, y2_intersect, _TURN_ROOT_2, discriminant, dot1, dot2
+    if dot1 > dot2:
+        return turn_direction, cx, cy, x1_intersect, y1_intersect, _TURN_ROOT_1_FALLBACK, discriminant, dot1, dot2
+    return turn_direction, cx, cy, x2_intersect, y2_intersect, _TURN_ROOT_2_FALLBACK, discriminant, dot1, dot2
+
+
+def _straigthening_point_xy(inbound_bearing: float, aprox_outbound_bearing: float, sx: float, sy: float, dx: float, dy: float, turn_radius_m: float) -> Tuple[int, float, float, float, float]:
+    """Turn geometry in map coordinates, from the start point (sx, sy) towards (dx, dy).
+
+    Returns (turn_direction, cx, cy, sx_result, sy_result): the centre of the
+    turning circle and the straigthening point, both in map coordinates.
+    """
+    logger.debug("Start point: %s, %s", sx, sy)
+
+    turn_direction, cx, cy, sx_result, sy_result, status, discriminant, dot1, dot2 = _turn_geometry_kernel(
+        float(inbound_bearing), float(aprox_outbound_bearing),
+        float(sx), float(sy), float(dx), float(dy), float(turn_radius_m)
+    )
 
-    s_lat, s_lon = _unproject(transformer, sx_result, sy_result)
-    return turn_data, s_lat, s_lon
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Left turn" if turn_direction == 1 else "Right turn")
+        logger.debug("Centre of the turning circle: %s, %s", cx, cy)
+        logger.debug("Destination point: %s, %s", dx, dy)
+        logger.debug("Discriminant: %.2f", discriminant)
+
+    if status == _TURN_DEGENERATE:
+        raise ValueError("Line is degenerate (both A and B are zero)")
+    if status == _TURN_NO_INTERSECTION:
+        raise ValueError(f"No intersection: line does not intersect circle (discriminant={discriminant})")
+    if status == _TURN_HORIZONTAL:
+        logger.debug("Edge case: horizontal line, sx_result=%.2f, sy_result=%.2f", sx_result, sy_result)
+    elif status == _TURN_ROOT_1:
+        logger.debug("Selected intersection point 1 (dot=%.2f)", dot1)
+    elif status == _TURN_ROOT_2:
+        logger.debug("Selected intersection point 2 (dot=%.2f)", dot2)
+    elif status == _TURN_ROOT_1_FALLBACK:
+        logger.warning("Both dot products negative, selected point 1 (dot=%.2f vs %.2f)", dot1, dot2)
+    else:
+        logger.warning("Both dot products negative, selected point 2 (dot=%.2f vs %.2f)", dot2, dot1)
+
+    return turn_direction, cx, cy, sx_result, sy_result
+
+
+@_jit
+def _wind_triangle_kernel(tas, wind_speed, wind_to_rad, course):
+    """Cruise ground speed (knots) and heading (degrees) on a course (numba-compiled when available).
+
+    wind_to_rad is the direction the wind blows towards, in radians.
+    """
+    wind_angle_rad = wind_to_rad - math.radians(course)
+    tail_component = wind_speed * math.cos(wind_angle_rad)
+    cross_component = wind_speed * math.sin(wind_angle_rad)
+    ground_speed = tas + tail_component
+    wca_ratio = cross_component / ground_speed
+    # numba returns nan where math.asin raises: keep the plain Python error
+    if wca_ratio > 1.0 or wca_ratio < -1.0:
+        raise ValueError("math domain error")
+    heading = (course - math.asin(wca_ratio) * 180 / math.pi + 360) % 360
+    return ground_speed, heading
 
 
 def apply_wind(tas: float, wind_speed: float, wind_dir: float, course: float) -> float:
@@ -524,6 +710,11 @@ def compute_leg_segments(
 
 class LegData:
     """Represent a leg with all the data to display."""
+    __slots__ = (
+        'origin', 'destination', 'straigthening_point', 'turn_data', 'course',
+        'distanceNm', 'eteSec', 'legFuel', 'heading', 'tas', 'prev_alt', 'alt',
+        'time_to_straightening_s', 'turn_angle_rad', 'turn_direction',
+    )
     origin: Point               # Origin turnpoint (where the turn starts)
     destination: Point          # Destination turnpoint
     straigthening_point: Point  # Point where the turn is finished
@@ -540,15 +731,40 @@ class LegData:
     turn_angle_rad: float       # Turn angle in radians (along the arc)
     turn_direction: int         # Turn direction: 1 for counter-clockwise, -1 for clockwise
 
-    def __init__(self, flightPlan: FlightPlan, indexWptFrom: int, indexWptTo: int, inbound_bearing: float, transformer: Transformer = None, navigation_mode: str = "geographic"):
-        """Initialize a new leg from indexWptFrom to indexWptTo."""
-
-        logger.info(f"== Calculating leg from {indexWptFrom} to {indexWptTo} ==")
+    def __init__(self, flightPlan: FlightPlan, indexWptFrom: int, indexWptTo: int, inbound_bearing: float, transformer: Transformer = None, navigation_mode: str = "geographic", gc_bearing: float | None = None, gc_distance: float | None = None, point_caches: List[_PointCache] | None = None, waypoints_xy: Tuple[List[float], List[float]] | None = None, tan_bank: float | None = None, raw_bearing: float | None = None, wind_to_rad: float | None = None):
+        """Initialize a new leg from indexWptFrom to indexWptTo.
+
+        gc_bearing / gc_distance are the precomputed great-circle bearing and
+        distance between the two waypoints (see _great_circle_legs); they are
+        used in 'geographic' mode when the leg has no initial turn.
+        point_caches holds the per-waypoint radians/trig shared by all the legs
+        of the plan (see _PointCache), waypoints_xy the waypoints projected to
+        map coordinates as (xs, ys), and tan_bank the tangent of the plan bank
+        angle (constant for the whole plan). raw_bearing is the precomputed
+        waypoint-to-waypoint bearing in the navigation mode of the theatre.
+        wind_to_rad is the direction the destination wind blows towards, in
+        radians (wind direction + 180).
+        """
+
+        logger.debug("== Calculating leg from %d to %d ==", indexWptFrom, indexWptTo)
         self.origin = Point(flightPlan.points[indexWptFrom].lat, flightPlan.points[indexWptFrom].lon)
         self.destination = Point(flightPlan.points[indexWptTo].lat, flightPlan.points[indexWptTo].lon)
 
-        turn_radius_m = (flightPlan.points[indexWptTo].tas * 0.514)**2 / (9.80665 * math.tan(math.radians(flightPlan.bankAngle)))
-        logger.info(f"Turn radius: {turn_radius_m:.2f} meters")
+        if tan_bank is None:
+            tan_bank = math.tan(math.radians(flightPlan.bankAngle))
+        turn_radius_m = (flightPlan.points[indexWptTo].tas * 0.514)**2 / (9.80665 * tan_bank)
+        logger.debug("Turn radius: %.2f meters", turn_radius_m)
+
+        geographic = not (navigation_mode == "projected" and transformer is not None)
+
+        # Waypoints already projected by FlightPlanData (one PROJ call for the whole plan)
+        if waypoints_xy is not None:
+            xs, ys = waypoints_xy
+            entry_xy = (xs[indexWptFrom], ys[indexWptFrom])
+            dest_xy = (xs[indexWptTo], ys[indexWptTo])
+        else:
+            entry_xy = dest_xy = None
+        center_xy = exit_xy = None
 
         # Calculate the straigthening point (point where the turn is finished).
         if indexWptFrom == 0:
@@ -557,72 +773,88 @@ class LegData:
             s_lat, s_lon = self.origin.lat, self.origin.lon
             turn_data = TurnData(0, 0)
             turn_direction = 1  # Default, not used for first leg
+            exit_xy = entry_xy
         else:
-            turn_data, s_lat, s_lon = calculate_straigthening_point(inbound_bearing, flightPlan.points[indexWptFrom], flightPlan.points[indexWptTo], turn_radius_m, transformer, navigation_mode)
+            if raw_bearing is not None:
+                aprox_outbound_bearing = raw_bearing
+            elif not geographic and entry_xy is not None and dest_xy is not None:
+                aprox_outbound_bearing = (math.degrees(math.atan2(dest_xy[0] - entry_xy[0], dest_xy[1] - entry_xy[1])) + 360) % 360
+            elif geographic and point_caches is not None:
+                aprox_outbound_bearing = _bearing_cached(point_caches[indexWptFrom], point_caches[indexWptTo])
+            else:
+                aprox_outbound_bearing = calculate_bearing(self.origin, self.destination, navigation_mode, transformer)
+
+            if entry_xy is not None and dest_xy is not None:
+                (entry_x, entry_y), (dest_x, dest_y) = entry_xy, dest_xy
+                _, cx, cy, sx, sy = _straigthening_point_xy(inbound_bearing, aprox_outbound_bearing, entry_x, entry_y, dest_x, dest_y, turn_radius_m)
+                (c_lat, s_lat), (c_lon, s_lon) = _unproject_many(transformer, [cx, sx], [cy, sy])
+                turn_data = TurnData(c_lat, c_lon)
+                center_xy, exit_xy = (cx, cy), (sx, sy)
+            else:
+                turn_data, s_lat, s_lon = calculate_straigthening_point(inbound_bearing, flightPlan.points[indexWptFrom], flightPlan.points[indexWptTo], turn_radius_m, transformer, navigation_mode)
         self.straigthening_point = Point(s_lat, s_lon)
-        logger.info(f"Straigthening point: {self.straigthening_point}")
+        logger.debug("Straigthening point: %s", self.straigthening_point)
         self.turn_data = turn_data
 
-        # Calculate the course and distance of the leg.
-        bearing = calculate_bearing(self.straigthening_point, self.destination, navigation_mode, transformer)
+        # Calculate the course and the straight distance of the leg.
+        # Without an initial turn the leg is the straight waypoint-to-waypoint segment.
+        if indexWptFrom == 0 and geographic and gc_bearing is not None and gc_distance is not None:
+            bearing, straight_distance = gc_bearing, gc_distance
+        elif not geographic and exit_xy is not None and dest_xy is not None:
+            ex = dest_xy[0] - exit_xy[0]
+            ey = dest_xy[1] - exit_xy[1]
+            bearing = (math.degrees(math.atan2(ex, ey)) + 360) % 360
+            straight_distance = math.sqrt(ex ** 2 + ey ** 2)
+        elif geographic:
+            s_cache = _PointCache.from_lat_lon(s_lat, s_lon)
+            dest_cache = point_caches[indexWptTo] if point_caches is not None else _PointCache.from_lat_lon(self.destination.lat, self.destination.lon)
+            bearing, straight_distance = _bearing_and_distance(s_cache, dest_cache)
+        else:
+            bearing = calculate_bearing(self.straigthening_point, self.destination, navigation_mode, transformer)
+            straight_distance = calculate_distance(self.straigthening_point, self.destination, navigation_mode, transformer)
+        # + 360 keeps the operand positive: a tiny negative sum would give exactly 360.0
         self.course = (bearing + flightPlan.declination + 360) % 360
-        logger.info(f"Course: {self.course}")
+        logger.debug("Course: %s", self.course)
 
         # Calculate the distance of the leg.
         if indexWptFrom == 0:
             turn_angle_rd = 0
             arc_distance = 0
         else:
-            cx, cy = _project(transformer, turn_data.center.lat, turn_data.center.lon)
-            sx_entry, sy_entry = _project(transformer, self.origin.lat, self.origin.lon)
-            sx_exit, sy_exit = _project(transformer, self.straigthening_point.lat, self.straigthening_point.lon)
+            if center_xy is not None and entry_xy is not None and exit_xy is not None:
+                cx, cy = center_xy
+                sx_entry, sy_entry = entry_xy
+                sx_exit, sy_exit = exit_xy
+            else:
+                cx, cy = _project(transformer, turn_data.center.lat, turn_data.center.lon)
+                sx_entry, sy_entry = _project(transformer, self.origin.lat, self.origin.lon)
+                sx_exit, sy_exit = _project(transformer, self.straigthening_point.lat, self.straigthening_point.lon)
 
             angle_entry = math.atan2(sy_entry - cy, sx_entry - cx)
             angle_exit = math.atan2(sy_exit - cy, sx_exit - cx)
 
-            aprox_outbound_bearing = calculate_bearing(self.origin, self.destination, navigation_mode, transformer)
-            if (aprox_outbound_bearing - inbound_bearing + 360) % 360 > 180:
-                turn_direction = 1  # Counter-clockwise
-            else:
-                turn_direction = -1  # Clockwise
-
-            def normalize_angle(angle):
-                """Normalize angle to [0, 2π)"""
-                while angle < 0:
-                    angle += 2 * math.pi
-                while angle >= 2 * math.pi:
-                    angle -= 2 * math.pi
-                return angle
-
-            angle_entry_norm = normalize_angle(angle_entry)
-            angle_exit_norm = normalize_angle(angle_exit)
-
-            if turn_direction == 1:  # Counter-clockwise: increasing angle direction
-                if angle_exit_norm >= angle_entry_norm:
-                    turn_angle_rd = angle_exit_norm - angle_entry_norm
-                else:
-                    turn_angle_rd = (2 * math.pi - angle_entry_norm) + angle_exit_norm
-            else:  # Clockwise: decreasing angle direction
-                if angle_exit_norm <= angle_entry_norm:
-                    turn_angle_rd = angle_entry_norm - angle_exit_norm
-                else:
-                    turn_angle_rd = angle_entry_norm + (2 * math.pi - angle_exit_norm)
+            # 1 = counter-clockwise, -1 = clockwise
+            turn_direction = 2 * ((aprox_outbound_bearing - inbound_bearing + 360) % 360 > 180) - 1
+
+            # Angle swept from entry to exit in the turn direction, in [0, 2π)
+            turn_angle_rd = (turn_direction * (angle_exit - angle_entry)) % (2 * math.pi)
 
-        logger.info(f"Turn angle: {math.degrees(turn_angle_rd):.2f} degrees")
+        logger.debug("Turn angle: %.2f degrees", math.degrees(turn_angle_rd))
         self.turn_angle_rad = turn_angle_rd
         self.turn_direction = turn_direction if indexWptFrom > 0 else 1
 
         arc_distance = turn_radius_m * turn_angle_rd
-        distance = arc_distance + calculate_distance(self.straigthening_point, self.destination, navigation_mode, transformer)
+        distance = arc_distance + straight_distance
         self.distanceNm = distance / 1852
 
         # Calculate wind for heading and arc time (uses destination wind)
-        windAngleRad = ((((flightPlan.points[indexWptTo].windDir + 180) % 360) - self.course + 360) % 360) * (math.pi / 180)
-        tailComponent = flightPlan.points[indexWptTo].windSpeed * math.cos(windAngleRad)
-        crossComponent = flightPlan.points[indexWptTo].windSpeed * math.sin(windAngleRad)
-        cruiseGroundSpeed = flightPlan.points[indexWptTo].tas + tailComponent
+        if wind_to_rad is None:
+            wind_to_rad = math.radians(flightPlan.points[indexWptTo].windDir + 180)
+        cruiseGroundSpeed, self.heading = _wind_triangle_kernel(
+            float(flightPlan.points[indexWptTo].tas), float(flightPlan.points[indexWptTo].windSpeed),
+            float(wind_to_rad), float(self.course)
+        )
         self.time_to_straightening_s = round((arc_distance / 1852) / cruiseGroundSpeed * 3600)
-        self.heading = (self.course - math.asin(crossComponent / cruiseGroundSpeed) * 180 / math.pi + 360) % 360
 
         # Regime-aware ETE and fuel
         regime_id = flightPlan.points[indexWptTo].regimeId
@@ -660,9 +892,10 @@ class LegData:
         self.prev_alt = (origin_pt.groundAlt or 0) if leg_index == 0 else origin_pt.alt
         self.alt = flightPlan.points[indexWptTo].alt
 
-        logger.info(f"ETE: {self.eteSec}")
-        logger.info(f"Leg fuel: {self.legFuel}")
-        logger.info(f"Heading: {self.heading}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("ETE: %s", self.eteSec)
+            logger.debug("Leg fuel: %s", self.legFuel)
+            logger.debug("Heading: %s", self.heading)
 
     def __repr__(self) -> str:
         return f"LegData(course={self.course}, distanceNm={self.distanceNm}, eteSec={self.eteSec}, legFuel={self.legFuel}, heading={self.heading})"
@@ -689,6 +922,21 @@ class FlightPlanData:
         transformer = _create_transformer(theatre_config)
         navigation_mode = theatre_config.get("navigation_mode", "geographic")
 
+        # Great-circle bearing/distance of every leg in one vectorized pass
+        soa = flightPlan.as_soa()
+        gc_bearings, gc_distances = _great_circle_legs(soa['lat'], soa['lon'])
+        gc_bearings = gc_bearings.tolist()
+        gc_distances = gc_distances.tolist()
+        point_caches = _point_caches(soa['lat'], soa['lon'])
+        xs, ys = transformer.transform(soa['lon'], soa['lat'])
+        waypoints_xy = (xs.tolist(), ys.tolist())
+        if navigation_mode == "projected":
+            raw_bearings = ((np.degrees(np.arctan2(np.diff(xs), np.diff(ys))) + 360) % 360).tolist()
+        else:
+            raw_bearings = gc_bearings
+        tan_bank = math.tan(math.radians(flightPlan.bankAngle))
+        wind_to_rad = np.radians(soa['windDir'] + 180).tolist()
+
         hackOffsetSec: int | None = None
         previousEta = flightPlan.initTimeSec
         previousEfr = flightPlan.initFob - flightPlan.aircraft.taxiFuel
@@ -704,7 +952,11 @@ class FlightPlanData:
             else:
                 if i < len(flightPlan.points):
                     inbound_bearing = self.legData[-1].heading if len(self.legData) > 0 else 0
-                    leg = LegData(flightPlan, i-1, i, inbound_bearing, transformer, navigation_mode)
+                    leg = LegData(flightPlan, i-1, i, inbound_bearing, transformer, navigation_mode,
+                                  gc_bearing=gc_bearings[i-1], gc_distance=gc_distances[i-1],
+                                  point_caches=point_caches, waypoints_xy=waypoints_xy,
+                                  tan_bank=tan_bank, raw_bearing=raw_bearings[i-1],
+                                  wind_to_rad=wind_to_rad[i])
                     self.legData.append(leg)
                 tp = TurnpointData()
                 arrivalEta = previousEta + leg.eteSec
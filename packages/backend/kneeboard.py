@@ -7,18 +7,26 @@ kneeboard PNG images.
 
 import pprint
 import time
-from typing import Callable, Tuple, Optional, Dict, List
+from typing import Callable, Tuple, Optional, Dict, List, Union, FrozenSet, Sequence
 import zipfile
-from PIL import Image
+from PIL import Image, ImageDraw
 import math
 import io
 import os
 import json
 import logging
-from pydantic import BaseModel, Field
+import multiprocessing
+import threading
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from dataclasses import dataclass
+from pydantic import BaseModel, Field, PrivateAttr
 from pyproj import Transformer
 from map_annotations import annotate_map, draw_info_box, draw_comment_strip
-from flight_plan import FlightPlan, FlightPlanData
+from flight_plan import FlightPlan, FlightPlanData, _cached_transformer
 from waypoint_list_page import generate_waypoint_list_page
 
 # Set up logger (logging configuration is handled centrally in main.py)
@@ -57,6 +65,15 @@ class MapInfo(BaseModel):
     minZoom: Optional[int] = None
     maxZoom: Optional[int] = None
     tileSize: Optional[int] = 256
+    # Projected (origin_x, origin_y, ref_x, ref_y) of the grid corners, see _grid_corners_tm
+    _grid_corners_tm: Optional[Tuple[float, float, float, float]] = PrivateAttr(default=None)
+    # Zoom level -> ZoomLevelInfo and zoom level -> resolution, see _build_zoom_tables
+    _zoom_by_level: Optional[Dict[int, ZoomLevelInfo]] = PrivateAttr(default=None)
+    _resolution_by_zoom: Optional[Dict[int, float]] = PrivateAttr(default=None)
+    # Available zoom levels in ascending order, see _zoom_levels
+    _sorted_zooms: Optional[Tuple[int, ...]] = PrivateAttr(default=None)
+    # True when zoom levels are contiguous and each doubles the width of the previous one
+    _zoom_is_geometric: bool = PrivateAttr(default=False)
 
 
 def generate_kneeboard_single_png(flight_plan: FlightPlan, leg_index: int, details: set[str] = None) -> bytes:
@@ -77,10 +94,17 @@ def generate_kneeboard_single_png(flight_plan: FlightPlan, leg_index: int, detai
     if len(flight_plan.points) < 2:
         raise ValueError("Flight plan must have at least 2 waypoints to generate a leg map")
     
-    # Generate map for the given leg
-    flightPlanData = FlightPlanData(flight_plan)
-    logger.info(f"Flight plan data: {pprint.pformat(flightPlanData)}")
-    leg_map_png = generate_leg_map(flight_plan, flightPlanData, leg_index, details or set())
+    details = details or set()
+    cache_key = (flight_plan.model_dump_json(), leg_index, frozenset(details))
+    leg_map_png = _get_cached_leg_map(cache_key)
+    if leg_map_png is None:
+        # Generate map for the given leg
+        flightPlanData = FlightPlanData(flight_plan)
+        logger.info(f"Flight plan data: {pprint.pformat(flightPlanData)}")
+        leg_map_png = generate_leg_map(flight_plan, flightPlanData, leg_index, details)
+        _store_leg_map(cache_key, leg_map_png)
+    else:
+        logger.info(f"Leg {leg_index} map taken from the cache")
     logger.info(f"Kneeboard PNG generated: {len(leg_map_png)} bytes")
 
     return leg_map_png
@@ -101,16 +125,9 @@ def generate_kneeboard_zip(flight_plan: FlightPlan, progress_callback: Optional[
     
     # Generate all leg maps
     flightPlanData = FlightPlanData(flight_plan)
-    leg_maps = []
-    for i in range(len(flightPlanData.legData)):
-        logger.info(f"Processing leg {i+1}/{len(flightPlanData.legData)}")
-
-        if progress_callback:
-            progress_callback(f"Generating leg {i+1}/{len(flightPlanData.legData)} map...")
-        leg_map = generate_leg_map(flight_plan, flightPlanData, i, details or set())
-        leg_maps.append(leg_map)
-        logger.info(f"Leg {i+1}/{len(flightPlanData.legData)} completed: {len(leg_map)} bytes")
-
+    # Project the anchor points of every page at once
+    anchors = _project_anchors(flight_plan, flightPlanData, _transformer_for_projection(_get_map_info(flight_plan.theatre)))
+    leg_maps = _generate_leg_maps(flight_plan, flightPlanData, details or set(), anchors, progress_callback)
     logger.info(f"All leg maps generated: {len(leg_maps)} maps")
 
     # Generate waypoint list page
@@ -123,7 +140,7 @@ def generate_kneeboard_zip(flight_plan: FlightPlan, progress_callback: Optional[
     from overview_map_page import generate_overview_map_page
     if progress_callback:
         progress_callback("Generating overview map page...")
-    overview_page = generate_overview_map_page(flight_plan, flightPlanData)
+    overview_page = generate_overview_map_page(flight_plan, flightPlanData, anchors)
     logger.info(f"Overview map page generated: {len(overview_page)} bytes")
 
     # Create ZIP file
@@ -137,6 +154,201 @@ def generate_kneeboard_zip(flight_plan: FlightPlan, progress_callback: Optional[
             zipf.writestr(filename, leg_map)
     return zip_data.getvalue()
 
+
+def _generate_leg_maps(
+    flight_plan: FlightPlan,
+    flight_plan_data: FlightPlanData,
+    details: set[str],
+    anchors: "_ProjectedAnchors",
+    progress_callback: Optional[Callable[[str], None]] = None
+) -> List[bytes]:
+    """
+    Generate the map of every leg, in the leg map worker processes when there are several legs.
+    
+    Legs already rendered for the same plan and details are taken from the
+    leg map cache.
+    
+    Returns:
+        PNG image data of each leg, in leg order
+    """
+    num_legs = len(flight_plan_data.legData)
+    plan_json = flight_plan.model_dump_json()
+    cache_keys = [(plan_json, i, frozenset(details)) for i in range(num_legs)]
+    leg_maps: List[Optional[bytes]] = [_get_cached_leg_map(key) for key in cache_keys]
+    to_render = [i for i in range(num_legs) if leg_maps[i] is None]
+    if len(to_render) < num_legs:
+        logger.info(f"{num_legs - len(to_render)}/{num_legs} leg maps taken from the cache")
+
+    if len(to_render) > 1 and LEG_MAP_WORKERS > 1:
+        jobs = [(flight_plan, flight_plan_data, i, details) for i in to_render]
+        try:
+            # map() submits every leg at once: report the start, then each leg as it comes back
+            results = _get_leg_map_pool().map(_generate_leg_map_job, jobs)
+            if progress_callback:
+                progress_callback(f"Generating {len(to_render)} leg maps in parallel...")
+            for i, leg_map in zip(to_render, results):
+                if progress_callback:
+                    progress_callback(f"Leg {i+1}/{num_legs} done")
+                leg_maps[i] = leg_map
+                _store_leg_map(cache_keys[i], leg_map)
+                logger.info(f"Leg {i+1}/{num_legs} completed: {len(leg_map)} bytes")
+            return _rendered_leg_maps(leg_maps)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory): drop the pool and render here instead
+            logger.error(f"Leg map worker pool failed, generating leg maps serially: {e}")
+            _reset_leg_map_pool()
+
+    for i in to_render:
+        if leg_maps[i] is not None:
+            continue
+        logger.info(f"Processing leg {i+1}/{num_legs}")
+
+        if progress_callback:
+            progress_callback(f"Generating leg {i+1}/{num_legs} map...")
+        leg_map = generate_leg_map(flight_plan, flight_plan_data, i, details, anchors)
+        leg_maps[i] = leg_map
+        _store_leg_map(cache_keys[i], leg_map)
+        logger.info(f"Leg {i+1}/{num_legs} completed: {len(leg_map)} bytes")
+    return _rendered_leg_maps(leg_maps)
+
+
+def _rendered_leg_maps(leg_maps: List[Optional[bytes]]) -> List[bytes]:
+    """Return the leg maps once every leg has been rendered or taken from the cache."""
+    rendered = [leg_map for leg_map in leg_maps if leg_map is not None]
+    assert len(rendered) == len(leg_maps), "Some leg maps were not rendered"
+    return rendered
+
+
+def _generate_leg_map_job(job: Tuple[FlightPlan, FlightPlanData, int, set]) -> bytes:
+    """Leg map worker entry point (module level so the process pool can pickle it)."""
+    flight_plan, flight_plan_data, leg_index, details = job
+    return generate_leg_map(flight_plan, flight_plan_data, leg_index, details)
+
+
+_leg_map_pool: Optional[ProcessPoolExecutor] = None
+_leg_map_pool_lock = threading.Lock()
+
+
+def _get_leg_map_pool() -> ProcessPoolExecutor:
+    """
+    Return the leg map worker pool, started on first use.
+    
+    The pool is kept for the next kneeboards, so the workers' start-up cost
+    and their tile caches are shared between requests.
+    """
+    global _leg_map_pool
+    with _leg_map_pool_lock:
+        if _leg_map_pool is None:
+            # Not fork: the server process runs threads (request handlers, task queue)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _leg_map_pool = ProcessPoolExecutor(
+                max_workers=LEG_MAP_WORKERS, mp_context=context, initializer=_load_all_map_info
+            )
+            logger.info(f"Started leg map worker pool with {LEG_MAP_WORKERS} processes")
+        return _leg_map_pool
+
+
+def _load_all_map_info() -> None:
+    """
+    Load the map info of every theatre into the _get_map_info cache.
+    
+    Run once in each leg map worker as it starts, so the theatre files are
+    parsed and the grid corners and zoom tables computed before the first leg
+    instead of during it.
+    """
+    for filename in sorted(os.listdir(THEATRES_DIR)):
+        theatre, ext = os.path.splitext(filename)
+        if ext == '.json':
+            try:
+                _get_map_info(theatre)
+            except Exception as e:
+                logger.warning(f"Failed to preload map info for {theatre}: {e}")
+
+
+_leg_map_cache: "OrderedDict[Tuple[str, int, FrozenSet[str]], bytes]" = OrderedDict()
+_leg_map_cache_lock = threading.Lock()
+
+
+def _get_cached_leg_map(key: Tuple[str, int, FrozenSet[str]]) -> Optional[bytes]:
+    """
+    Return the leg map PNG rendered for the given key, or None.
+    
+    The key is (plan JSON, leg index, details): a page only depends on the
+    plan, the leg and the details, so an identical re-render is served as-is.
+    """
+    with _leg_map_cache_lock:
+        png = _leg_map_cache.get(key)
+        if png is not None:
+            _leg_map_cache.move_to_end(key)
+        return png
+
+
+def _store_leg_map(key: Tuple[str, int, FrozenSet[str]], png: bytes) -> None:
+    """Keep a rendered leg map PNG, dropping the least recently used beyond LEG_MAP_CACHE_SIZE."""
+    with _leg_map_cache_lock:
+        _leg_map_cache[key] = png
+        _leg_map_cache.move_to_end(key)
+        while len(_leg_map_cache) > LEG_MAP_CACHE_SIZE:
+            _leg_map_cache.popitem(last=False)
+
+
+def _reset_leg_map_pool() -> None:
+    """Shut the leg map worker pool down; the next kneeboard starts a new one."""
+    global _leg_map_pool
+    with _leg_map_pool_lock:
+        if _leg_map_pool is not None:
+            _leg_map_pool.shutdown(wait=False, cancel_futures=True)
+            _leg_map_pool = None
+
+
+def _available_cpus() -> int:
+    """
+    Return the number of CPUs this process may actually use.
+    
+    Takes the CPU affinity and the cgroup CPU quota (containers started with
+    --cpus) into account, which os.cpu_count() ignores.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    # cgroup v2 (cpu.max: "<quota> <period>" or "max <period>"), then cgroup v1
+    quota_files = [("/sys/fs/cgroup/cpu.max", None),
+                   ("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "/sys/fs/cgroup/cpu/cpu.cfs_period_us")]
+    for quota_path, period_path in quota_files:
+        try:
+            with open(quota_path) as f:
+                values = f.read().split()
+            if period_path is not None:
+                with open(period_path) as f:
+                    values.append(f.read().strip())
+            quota, period = values[0], values[1]
+            if quota not in ("max", "-1") and int(period) > 0:
+                cpus = min(cpus, max(1, int(quota) // int(period)))
+            break
+        except (OSError, ValueError, IndexError):
+            continue
+    return max(1, cpus)
+
+
+def _leg_map_workers() -> int:
+    """
+    Return the number of leg map worker processes.
+    
+    Read from the LEG_MAP_WORKERS environment variable, by default the
+    available CPUs capped at MAX_LEG_MAP_WORKERS: each worker holds its own
+    tile cache (see DEPLOYMENT.md for the memory cost).
+    """
+    env_workers = os.getenv("LEG_MAP_WORKERS")
+    if env_workers:
+        try:
+            return max(1, int(env_workers))
+        except ValueError:
+            logger.warning(f"Invalid LEG_MAP_WORKERS value {env_workers!r}, using the default")
+    return min(_available_cpus(), MAX_LEG_MAP_WORKERS)
+
+
 # Constants for leg map generation
 TILES_DIR = os.path.join(os.path.dirname(__file__), "config", "static", "tiles")
 BLANK_TILE_PATH = os.path.join(os.path.dirname(__file__), "config", "blank.png")
@@ -146,10 +358,45 @@ MAP_WIDTH = 768
 MAP_HEIGHT = 1024
 LEG_HEIGHT_TARGET = 0.70  # Leg should occupy 70% of height
 TILE_SIZE = 256  # Standard tile size in pixels
+TILE_FETCH_WORKERS = 8  # Threads loading tiles in parallel (PNG decode releases the GIL)
+TILE_CACHE_SIZE = 512  # Decoded tiles kept in memory (~96 MiB of RGB 256x256 tiles)
+MAX_LEG_MAP_WORKERS = 4  # Default cap on the leg map processes (each one holds its own caches)
+LEG_MAP_WORKERS = _leg_map_workers()  # Processes rendering leg maps (CPU bound: resampling, PNG encoding)
+FUSED_SCALE_MIN = 0.8  # Composites scaled by [FUSED_SCALE_MIN, 1] are scaled by the rotation itself
+ROTATE_RESAMPLE = Image.Resampling.BILINEAR  # Filter of the map rotation (NEAREST is faster but jagged)
+PNG_COMPRESS_LEVEL = 1  # Map pages are stored as-is in the kneeboard zip: fast zlib beats smaller files
+LEG_MAP_CACHE_SIZE = 32  # Rendered leg map PNGs kept for identical re-renders (~1-2 MiB each)
 
 
+def _open_rgb(path: str) -> Image.Image:
+    """Decode an image as RGB, without the extra copy when it already is RGB."""
+    img = Image.open(path)
+    img.load()
+    return img if img.mode == 'RGB' else img.convert('RGB')
+
+
+def _load_blank_tile() -> Optional[Image.Image]:
+    """Load the blank fallback tile, or None if it is missing or unreadable."""
+    if os.path.exists(BLANK_TILE_PATH):
+        try:
+            return _open_rgb(BLANK_TILE_PATH)
+        except Exception as e:
+            logger.warning(f"Failed to load blank tile: {e}")
+    return None
+
+
+# Decoded once at import; shared by every missing tile (only ever pasted, never modified)
+_BLANK_TILE = _load_blank_tile()
+_WHITE_TILE = Image.new('RGB', (TILE_SIZE, TILE_SIZE), color='white')
+
+
+@lru_cache(maxsize=None)
 def _get_map_info(theatre: str) -> MapInfo:
-    """Load and return tile info from JSON file."""
+    """Load and return tile info from JSON file.
+
+    The result is cached per theatre and shared between requests, so it must
+    not be modified by the callers.
+    """
     map_info_path = os.path.join(THEATRES_DIR, f"{theatre}.json")
     logger.info(f"Loading map info from {map_info_path}")
     if not os.path.exists(map_info_path):
@@ -159,48 +406,88 @@ def _get_map_info(theatre: str) -> MapInfo:
         data = json.load(f)
         data['theatre'] = theatre
     map_info = MapInfo.model_validate(data)
+    _build_zoom_tables(map_info)
     logger.info(f"Map info loaded: {len(map_info.zoom_info)} zoom levels")
     return map_info
 
 
 def _transformer_for_projection(map_info: MapInfo) -> Transformer:
-    """Create a transformer for the projection."""
-    if map_info.projection == "transverse_mercator":
-        return Transformer.from_crs(
-            "EPSG:4326",  # WGS84
-            f"+proj=tmerc +lat_0=0 +lon_0={map_info.central_meridian} +k=1.0 +x_0=0 +y_0=0 +ellps=WGS84 +datum=WGS84 +units=m +no_defs",
-            always_xy=True
-        )
-    elif map_info.projection == "mercator":
-        return Transformer.from_crs(
-            "EPSG:4326",  # WGS84
-            "EPSG:3857",  # Web Mercator
-            always_xy=True
+    """Return the transformer for the map projection (shared with flight_plan)."""
+    return _cached_transformer(map_info.projection, map_info.central_meridian)
+
+
+def _grid_corners_tm(map_info: MapInfo) -> Tuple[float, float, float, float]:
+    """
+    Return the tile grid origin (NW) and reference (NE) corners in the projection.
+
+    Both corners are projected in a single transform call the first time and
+    kept on the MapInfo, as every helper below needs them.
+
+    Returns:
+        Tuple of (origin_x, origin_y, ref_x, ref_y) in meters
+    """
+    if map_info._grid_corners_tm is None:
+        transformer = _transformer_for_projection(map_info)
+        xs, ys = transformer.transform(
+            [map_info.origin_lon, map_info.ref_corner_ne_lon],
+            [map_info.origin_lat, map_info.ref_corner_ne_lat]
         )
-    else:
-        raise ValueError(f"Unsupported projection: {map_info.projection}")
+        map_info._grid_corners_tm = (xs[0], ys[0], xs[1], ys[1])
+    return map_info._grid_corners_tm
 
 
-def _calculate_distance_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two points in meters using Haversine formula."""
-    R = 6371000  # Earth's radius in meters
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-    
-    d_lat = lat2_rad - lat1_rad
-    d_lon = lon2_rad - lon1_rad
+def _build_zoom_tables(map_info: MapInfo) -> None:
+    """
+    Fill the zoom level and resolution tables of map_info.
     
-    a = math.sin(d_lat/2) * math.sin(d_lat/2) + \
-        math.cos(lat1_rad) * math.cos(lat2_rad) * \
-        math.sin(d_lon/2) * math.sin(d_lon/2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+    The grid corners are projected once and every zoom level's resolution
+    (meters per pixel) derived from them, so lookups on the hot paths are
+    plain dict reads.
+    """
+    origin_x, origin_y, ref_x, ref_y = _grid_corners_tm(map_info)
+    x_distance = math.hypot(ref_x - origin_x, ref_y - origin_y)
+    map_info._zoom_by_level = {z_info.zoom: z_info for z_info in map_info.zoom_info}
+    # Resolution = distance / pixels
+    map_info._resolution_by_zoom = {z_info.zoom: x_distance / z_info.width_px for z_info in map_info.zoom_info}
+    # Tile pyramids double the width at each level (up to pixel rounding), which
+    # lets _select_zoom_level compute the zoom with a log2 instead of a scan
+    levels = sorted(map_info.zoom_info, key=lambda z_info: z_info.zoom)
+    map_info._sorted_zooms = tuple(z_info.zoom for z_info in levels)
+    map_info._zoom_is_geometric = len(levels) > 1 and all(
+        b.zoom == a.zoom + 1 and abs(b.width_px / a.width_px - 2) < 0.01
+        for a, b in zip(levels, levels[1:])
+    )
+
+
+def _zoom_levels(map_info: MapInfo) -> Tuple[int, ...]:
+    """Return the available zoom levels of map_info in ascending order."""
+    if map_info._zoom_by_level is None:
+        _build_zoom_tables(map_info)
+    sorted_zooms = map_info._sorted_zooms
+    assert sorted_zooms is not None
+    return sorted_zooms
+
+
+def _zoom_level_info(map_info: MapInfo, zoom: int) -> ZoomLevelInfo:
+    """
+    Return the zoom level info for the given zoom level.
+
+    Raises:
+        ValueError: If the zoom level is not found in map_info
+    """
+    if map_info._zoom_by_level is None:
+        _build_zoom_tables(map_info)
+    zoom_by_level = map_info._zoom_by_level
+    assert zoom_by_level is not None
+    this_zoom = zoom_by_level.get(zoom)
+    if this_zoom is None:
+        raise ValueError(f"Zoom level {zoom} not found in map info")
+    return this_zoom
+
 
 def _get_resolution_for_zoom(map_info: MapInfo, zoom: int) -> float:
     """
-    Calculate resolution (meters per pixel) for a given zoom level.
+    Return the resolution (meters per pixel) for a given zoom level.
     
     Args:
         map_info: MapInfo object
@@ -208,25 +495,17 @@ def _get_resolution_for_zoom(map_info: MapInfo, zoom: int) -> float:
         
     Returns:
         Resolution in meters per pixel
+        
+    Raises:
+        ValueError: If the zoom level is not found in map_info
     """
-    # Calculate reference distance in the projection
-    transformer = _transformer_for_projection(map_info)
-    origin_x, origin_y = transformer.transform(map_info.origin_lon, map_info.origin_lat)
-    ref_x, ref_y = transformer.transform(map_info.ref_corner_ne_lon, map_info.ref_corner_ne_lat)
-    x_distance = math.sqrt((ref_x - origin_x)**2 + (ref_y - origin_y)**2)
-    
-    # Find zoom info for this zoom level
-    this_zoom = None
-    for z_info in map_info.zoom_info:
-        if z_info.zoom == zoom:
-            this_zoom = z_info
-            break
-    
-    if this_zoom is None:
-        raise ValueError(f"Zoom level {zoom} not found in tile info")
-    
-    # Resolution = distance / pixels
-    resolution = x_distance / this_zoom.width_px
+    if map_info._zoom_by_level is None:
+        _build_zoom_tables(map_info)
+    resolution_by_zoom = map_info._resolution_by_zoom
+    assert resolution_by_zoom is not None
+    resolution = resolution_by_zoom.get(zoom)
+    if resolution is None:
+        raise ValueError(f"Zoom level {zoom} not found in map info")
     return resolution
 
 
@@ -242,10 +521,15 @@ def _select_zoom_level(map_info: MapInfo, leg_distance_meters: float) -> Tuple[i
         Tuple of (selected zoom level, leg height in pixels at that zoom)
     """
     target_height_px = MAP_HEIGHT * LEG_HEIGHT_TARGET  # ~717 pixels
-    logger.debug(f"Target leg height: {target_height_px:.1f} pixels")
+    logger.debug("Target leg height: %.1f pixels", target_height_px)
     
+    if map_info._zoom_by_level is None:
+        _build_zoom_tables(map_info)
+    if map_info._zoom_is_geometric and leg_distance_meters > 0:
+        return _select_zoom_level_geometric(map_info, leg_distance_meters, target_height_px)
+
     # Try each zoom level from highest to lowest
-    zoom_levels = sorted([z_info.zoom for z_info in map_info.zoom_info], reverse=False)
+    zoom_levels = _zoom_levels(map_info)
     logger.info(f"Available zoom levels: {zoom_levels}")
     
     # Find the zoom level where leg height is just above target (or highest if all are below)
@@ -255,11 +539,11 @@ def _select_zoom_level(map_info: MapInfo, leg_distance_meters: float) -> Tuple[i
     for zoom in zoom_levels:
         resolution = _get_resolution_for_zoom(map_info, zoom)
         leg_height_px = leg_distance_meters / resolution
-        logger.debug(f"Zoom {zoom}: resolution={resolution:.2f} m/px, leg_height={leg_height_px:.1f} px")
+        logger.debug("Zoom %s: resolution=%.2f m/px, leg_height=%.1f px", zoom, resolution, leg_height_px)
         
         if leg_height_px > target_height_px:
             # This zoom gives more than 70%, use it
-            logger.debug(f"Selected zoom {zoom} (leg height {leg_height_px:.1f}px > target {target_height_px:.1f}px)")
+            logger.debug("Selected zoom %s (leg height %.1fpx > target %.1fpx)", zoom, leg_height_px, target_height_px)
             return zoom, leg_height_px
         
         # Track the largest zoom that's <= target (in case all are below target)
@@ -273,13 +557,95 @@ def _select_zoom_level(map_info: MapInfo, leg_distance_meters: float) -> Tuple[i
         resolution = _get_resolution_for_zoom(map_info, selected_zoom)
         selected_leg_height = leg_distance_meters / resolution
     
-    logger.debug(f"Using zoom {selected_zoom} (leg height {selected_leg_height:.1f}px <= target {target_height_px:.1f}px, will scale up)")
+    logger.debug("Using zoom %s (leg height %.1fpx <= target %.1fpx, will scale up)", selected_zoom, selected_leg_height, target_height_px)
     return selected_zoom, selected_leg_height
 
 
+def _select_zoom_level_geometric(map_info: MapInfo, leg_distance_meters: float,
+                                 target_height_px: float) -> Tuple[int, float]:
+    """
+    Closed-form version of _select_zoom_level for geometric tile pyramids.
+    
+    The leg height doubles with each zoom level, so the first level above the
+    target is min_zoom + floor(log2(res0 / needed_res)) + 1. The estimate is
+    then checked against the actual resolutions, since widths are rounded to
+    whole pixels, to pick exactly the level the scan would.
+    """
+    resolutions = map_info._resolution_by_zoom
+    assert resolutions is not None  # Only called once _build_zoom_tables has run
+    min_zoom = min(resolutions)
+    max_zoom = max(resolutions)
+    needed_resolution = leg_distance_meters / target_height_px
+    zoom = min_zoom + math.floor(math.log2(resolutions[min_zoom] / needed_resolution)) + 1
+    zoom = max(min_zoom, min(max_zoom, zoom))
+    # Correct the estimate by a level if pixel rounding put it on the wrong side
+    while zoom > min_zoom and leg_distance_meters / resolutions[zoom - 1] > target_height_px:
+        zoom -= 1
+    while zoom < max_zoom and leg_distance_meters / resolutions[zoom] <= target_height_px:
+        zoom += 1
+    leg_height_px = leg_distance_meters / resolutions[zoom]
+    logger.debug("Selected zoom %s (leg height %.1fpx, target %.1fpx)", zoom, leg_height_px, target_height_px)
+    return zoom, leg_height_px
+
+
+@lru_cache(maxsize=None)
+def _tile_pack(theatre_name: str, z: int) -> Optional[np.ndarray]:
+    """
+    Return the packed tiles of a zoom level, memory-mapped, or None if not packed.
+
+    Packs are built offline by packages/tools/scripts/pack_tiles.py as
+    {theatre}/tiles_{z}.npy with shape (nb_tiles_h, nb_tiles_w, TILE_SIZE, TILE_SIZE, 3),
+    so assembling a composite is a slice copy instead of a PNG decode per tile.
+    """
+    pack_path = os.path.join(TILES_DIR, theatre_name, f"tiles_{z}.npy")
+    if not os.path.exists(pack_path):
+        return None
+    try:
+        pack = np.load(pack_path, mmap_mode='r')
+    except Exception as e:
+        logger.warning(f"Failed to map tile pack {pack_path}: {e}")
+        return None
+    if pack.dtype != np.uint8 or pack.ndim != 5 or pack.shape[2:] != (TILE_SIZE, TILE_SIZE, 3):
+        logger.warning(f"Ignoring tile pack {pack_path} with unexpected shape {pack.shape}")
+        return None
+    logger.info(f"Using tile pack {pack_path}: {pack.shape[1]}x{pack.shape[0]} tiles")
+    return pack
+
+
+@lru_cache(maxsize=None)
+def _present_tiles(theatre_name: str, z: int) -> frozenset:
+    """
+    Return the (x, y) coordinates of the tiles available on disk for a zoom level.
+
+    The zoom directory is scanned once, so missing tiles are detected with a set
+    lookup instead of a stat call each.
+    """
+    zoom_dir = os.path.join(TILES_DIR, theatre_name, str(z))
+    present = set()
+    try:
+        with os.scandir(zoom_dir) as x_entries:
+            for x_entry in x_entries:
+                if not x_entry.is_dir() or not x_entry.name.isdigit():
+                    continue
+                x = int(x_entry.name)
+                with os.scandir(x_entry.path) as y_entries:
+                    for y_entry in y_entries:
+                        stem, ext = os.path.splitext(y_entry.name)
+                        if ext == '.png' and stem.isdigit():
+                            present.add((x, int(stem)))
+    except FileNotFoundError:
+        logger.error(f"Tile directory not found at {zoom_dir}")
+    logger.debug("Found %s tiles in %s", len(present), zoom_dir)
+    return frozenset(present)
+
+
+@lru_cache(maxsize=TILE_CACHE_SIZE)
 def _fetch_tile(theatre_name: str, z: int, x: int, y: int) -> Optional[Image.Image]:
     """
     Fetch a tile from the file system.
+
+    Decoded tiles are cached and shared between requests: callers must only
+    read or paste them, never modify them in place.
     
     Args:
         z, x, y: Tile coordinates
@@ -288,12 +654,12 @@ def _fetch_tile(theatre_name: str, z: int, x: int, y: int) -> Optional[Image.Ima
         PIL Image or None if tile doesn't exist
     """
     tile_path = os.path.join(TILES_DIR, theatre_name, str(z), str(x), f"{y}.png")
-    # logger.debug(f"Fetching tile z={z}, x={x}, y={y} from {tile_path}")
+    # logger.debug("Fetching tile z=%s, x=%s, y=%s from %s", z, x, y, tile_path)
     
-    if os.path.exists(tile_path):
+    if (x, y) in _present_tiles(theatre_name, z):
         try:
-            tile_img = Image.open(tile_path).convert('RGB')
-            # logger.debug(f"Successfully loaded tile z={z}, x={x}, y={y}")
+            tile_img = _open_rgb(tile_path)
+            # logger.debug("Successfully loaded tile z=%s, x=%s, y=%s", z, x, y)
             return tile_img
         except Exception as e:
             logger.warning(f"Failed to load tile z={z}, x={x}, y={y}: {e}")
@@ -301,16 +667,13 @@ def _fetch_tile(theatre_name: str, z: int, x: int, y: int) -> Optional[Image.Ima
         logger.error(f"Tile not found at {tile_path}")
     
     # Fallback to blank tile
-    if os.path.exists(BLANK_TILE_PATH):
-        try:
-            logger.info(f"Using blank tile for z={z}, x={x}, y={y}")
-            return Image.open(BLANK_TILE_PATH).convert('RGB')
-        except Exception as e:
-            logger.warning(f"Failed to load blank tile: {e}")
+    if _BLANK_TILE is not None:
+        logger.debug("Using blank tile for z=%s, x=%s, y=%s", z, x, y)
+        return _BLANK_TILE
     
     # If all else fails, return a white tile
-    logger.debug(f"Using white tile for z={z}, x={x}, y={y}")
-    return Image.new('RGB', (TILE_SIZE, TILE_SIZE), color='white')
+    logger.debug("Using white tile for z=%s, x=%s, y=%s", z, x, y)
+    return _WHITE_TILE
 
 
 def _bbox_tm_to_tile_bounds(
@@ -350,10 +713,9 @@ def _bbox_tm_to_tile_bounds(
         ValueError: If the zoom level is not found in map_info
     """
     min_x_tm, min_y_tm, max_x_tm, max_y_tm = bbox_tm
-    transformer = _transformer_for_projection(map_info)
     
     # Get the tile grid origin (NW corner) in the projection
-    origin_x, origin_y = transformer.transform(map_info.origin_lon, map_info.origin_lat)
+    origin_x, origin_y, _, _ = _grid_corners_tm(map_info)
     
     # Get resolution (meters per pixel) for this zoom level
     resolution = _get_resolution_for_zoom(map_info, zoom)
@@ -372,14 +734,7 @@ def _bbox_tm_to_tile_bounds(
     max_tile_y = int(max_px_y // TILE_SIZE)
     
     # Get zoom info to know the tile grid bounds
-    this_zoom = None
-    for z_info in map_info.zoom_info:
-        if z_info.zoom == zoom:
-            this_zoom = z_info
-            break
-    
-    if this_zoom is None:
-        raise ValueError(f"Zoom level {zoom} not found in map info")
+    this_zoom = _zoom_level_info(map_info, zoom)
     
     # Clamp tile coordinates to available tile grid bounds
     min_tile_x = max(0, min_tile_x)
@@ -397,10 +752,58 @@ def _bbox_tm_to_tile_bounds(
     return (min_tile_x, min_tile_y, max_tile_x, max_tile_y)
 
 
+def _assemble_tile_range(
+    theatre_name: str,
+    zoom: int,
+    min_tile_x: int,
+    min_tile_y: int,
+    max_tile_x: int,
+    max_tile_y: int,
+    tiles: Optional[FrozenSet[Tuple[int, int]]] = None
+) -> np.ndarray:
+    """
+    Fetch the tiles of a tile range and blit them into one RGB pixel buffer.
+    
+    Not cached: the tiles needed depend on each page's footprint, so no two
+    legs ask for the same buffer. Legs share the decoded tiles instead.
+    
+    Args:
+        theatre_name: Theatre of the tiles
+        zoom: Zoom level
+        min_tile_x, min_tile_y, max_tile_x, max_tile_y: Inclusive tile range
+        tiles: Tiles (x, y) to fetch, the other cells are left black (all if None)
+        
+    Returns:
+        (rows * TILE_SIZE, cols * TILE_SIZE, 3) uint8 array
+    """
+    img_width = (max_tile_x - min_tile_x + 1) * TILE_SIZE
+    img_height = (max_tile_y - min_tile_y + 1) * TILE_SIZE
+    
+    # Create composite pixel buffer (black where a tile does not cover its cell)
+    buf = np.zeros((img_height, img_width, 3), dtype=np.uint8)
+    logger.info(f"Creating composite image: {img_width}x{img_height} pixels, tiles: {max_tile_x - min_tile_x + 1}x{max_tile_y - min_tile_y + 1}")
+    
+    # Fetch tiles in parallel, then blit them serially into their slice of the buffer
+    coords = [(tx, ty) for ty in range(min_tile_y, max_tile_y + 1) for tx in range(min_tile_x, max_tile_x + 1)
+              if tiles is None or (tx, ty) in tiles]
+    with ThreadPoolExecutor(max_workers=TILE_FETCH_WORKERS) as executor:
+        tile_imgs = executor.map(lambda c: _fetch_tile(theatre_name, zoom, c[0], c[1]), coords)
+        tiles_fetched = 0
+        for (tx, ty), tile_img in zip(coords, tile_imgs):
+            x_pos = (tx - min_tile_x) * TILE_SIZE
+            y_pos = (ty - min_tile_y) * TILE_SIZE
+            tile_arr = np.asarray(tile_img)[:TILE_SIZE, :TILE_SIZE]
+            buf[y_pos:y_pos + tile_arr.shape[0], x_pos:x_pos + tile_arr.shape[1]] = tile_arr
+            tiles_fetched += 1
+    logger.info(f"Fetched and pasted {tiles_fetched} tiles, {img_width}x{img_height}")
+    return buf
+
+
 def _assemble_tiles(
     map_info: MapInfo,
     zoom: int,
-    bbox_tm: Tuple[float, float, float, float]
+    bbox_tm: Tuple[float, float, float, float],
+    tiles: Optional[FrozenSet[Tuple[int, int]]] = None
 ) -> Image.Image:
     """
     Assemble tiles covering the bounding box into a composite image.
@@ -409,6 +812,8 @@ def _assemble_tiles(
         map_info: MapInfo object
         zoom: Zoom level
         bbox_tm: Bounding box in Transverse Mercator (min_x, min_y, max_x, max_y)
+        tiles: Tiles (x, y) actually needed; the other cells of the composite
+            may be left black (all tiles if None)
         
     Returns:
         Composite PIL Image
@@ -419,16 +824,6 @@ def _assemble_tiles(
     # Convert bounding box to tile grid bounds using utility function
     min_tile_x, min_tile_y, max_tile_x, max_tile_y = _bbox_tm_to_tile_bounds(bbox_tm, map_info, zoom)
     
-    # Get zoom info for tile grid dimensions (needed for image size calculation)
-    this_zoom = None
-    for z_info in map_info.zoom_info:
-        if z_info.zoom == zoom:
-            this_zoom = z_info
-            break
-    
-    if this_zoom is None:
-        raise ValueError(f"Zoom level {zoom} not found")
-    
     # Calculate image size
     num_tiles_x = max_tile_x - min_tile_x + 1
     num_tiles_y = max_tile_y - min_tile_y + 1
@@ -436,27 +831,23 @@ def _assemble_tiles(
     # Safety check: ensure we have valid dimensions
     if num_tiles_x <= 0 or num_tiles_y <= 0:
         logger.error(f"Invalid tile range: x=[{min_tile_x}, {max_tile_x}], y=[{min_tile_y}, {max_tile_y}]")
-        resolution = _get_resolution_for_zoom(map_info.zoom_info, zoom)
+        resolution = _get_resolution_for_zoom(map_info, zoom)
         logger.error(f"Bounding box TM: {bbox_tm}, zoom: {zoom}, resolution: {resolution}")
         raise ValueError(f"Invalid tile coordinates: cannot create image with {num_tiles_x}x{num_tiles_y} tiles")
     
     img_width = num_tiles_x * TILE_SIZE
     img_height = num_tiles_y * TILE_SIZE
     
-    # Create composite image
-    composite = Image.new('RGB', (img_width, img_height))
-    logger.info(f"Creating composite image: {img_width}x{img_height} pixels, tiles: {num_tiles_x}x{num_tiles_y}")
+    pack = _tile_pack(map_info.theatre, zoom)
+    if pack is not None and max_tile_y < pack.shape[0] and max_tile_x < pack.shape[1]:
+        # (rows, cols, TILE_SIZE, TILE_SIZE, 3) -> (rows * TILE_SIZE, cols * TILE_SIZE, 3)
+        block = pack[min_tile_y:max_tile_y + 1, min_tile_x:max_tile_x + 1]
+        buf = np.ascontiguousarray(block.transpose(0, 2, 1, 3, 4)).reshape(img_height, img_width, 3)
+        composite = Image.fromarray(buf)
+        logger.info(f"Copied {num_tiles_x}x{num_tiles_y} tiles from the tile pack, {composite.width}x{composite.height}")
+        return composite
     
-    # Fetch and paste tiles
-    tiles_fetched = 0
-    for ty in range(min_tile_y, max_tile_y + 1):
-        for tx in range(min_tile_x, max_tile_x + 1):
-            tile_img = _fetch_tile(map_info.theatre, zoom, tx, ty)
-            x_pos = (tx - min_tile_x) * TILE_SIZE
-            y_pos = (ty - min_tile_y) * TILE_SIZE
-            composite.paste(tile_img, (x_pos, y_pos))
-            tiles_fetched += 1
-    logger.info(f"Fetched and pasted {tiles_fetched} tiles, {composite.width}x{composite.height}")
+    composite = Image.fromarray(_assemble_tile_range(map_info.theatre, zoom, min_tile_x, min_tile_y, max_tile_x, max_tile_y, tiles))
     
     # TODO: Crop to remove extra non needed data
 
@@ -492,83 +883,244 @@ def _create_bbox_around_leg(
     transformer = _transformer_for_projection(map_info)
 
     # Convert to the projection
-    x1, y1 = transformer.transform(lon1, lat1)
-    x2, y2 = transformer.transform(lon2, lat2)
+    (x1, x2), (y1, y2) = transformer.transform([lon1, lon2], [lat1, lat2])
+    return _bbox_around_projected_leg(x1, y1, x2, y2, zoom, map_info, scale_factor, margin_factor)
+
+
+def _bbox_around_projected_leg(
+    x1: float, y1: float,
+    x2: float, y2: float,
+    zoom: int,
+    map_info: MapInfo,
+    scale_factor: float = 1.0,
+    margin_factor: float = 1.0
+) -> Tuple[float, float, float, float]:
+    """
+    Same as _create_bbox_around_leg, for a leg already in the projection.
     
+    Args:
+        x1, y1: Starting point in meters
+        x2, y2: Ending point in meters
+        (others): see _create_bbox_around_leg
+    """
     # Get resolution to convert pixels to meters
     resolution = _get_resolution_for_zoom(map_info, zoom)
     
-    # Calculate the final image dimensions after scaling
-    # The final cropped image will be MAP_WIDTH x MAP_HEIGHT
-    # But before rotation, we need to ensure we have enough coverage
-    # The scaled composite will be smaller, but after rotation, we need diagonal coverage
-    
-    # Calculate the size of the scaled composite that will contain MAP_WIDTH x MAP_HEIGHT after rotation
-    # After scaling by scale_factor, the composite dimensions are scaled
-    # After rotation, a rectangle of size W x H needs a bounding box of diagonal = sqrt(W^2 + H^2)
-    # But we also need to account for the fact that we're scaling BEFORE rotation
-    
-    # The target final image is MAP_WIDTH x MAP_HEIGHT (in pixels)
-    # After rotation, we need diagonal coverage for the final image
-    final_diagonal_px = math.sqrt(MAP_WIDTH**2 + MAP_HEIGHT**2)
-    
-    # Before scaling, we need more coverage since we scale down
-    # If we scale by scale_factor, to get final_diagonal_px coverage after scaling,
-    # we need: pre_scale_diagonal_px = final_diagonal_px / scale_factor
-    pre_scale_diagonal_px = final_diagonal_px / scale_factor
+    # The output frame is rotated by an arbitrary angle, so the composite must
+    # cover the circle circumscribing the final MAP_WIDTH x MAP_HEIGHT image:
+    # a square whose half side is half the frame diagonal, converted to meters
+    # before scaling (scaling by scale_factor shrinks the composite).
+    half_diagonal_px = 0.5 * math.hypot(MAP_WIDTH, MAP_HEIGHT) / scale_factor
+    half_side_meters = half_diagonal_px * resolution * margin_factor
     
-    # Convert to meters using resolution
-    pre_scale_diagonal_meters = pre_scale_diagonal_px * resolution
-    
-    # Convert diagonal to square side (worst case for rotation)
-    # For a square with diagonal d: side = d / sqrt(2)
-    # Add extra margin for rotation
-    # side_meters = (pre_scale_diagonal_meters / math.sqrt(2)) * margin_factor
-    
-    # Not 100% sure, but I think dividing by 2 is sufficient (and result in a smaller area)
-    side_meters = pre_scale_diagonal_meters / 2
-    
-    half_width = side_meters
-    half_height = side_meters
+    half_width = half_side_meters
+    half_height = half_side_meters
     
     # Center of leg
     center_x = (x1 + x2) / 2
     center_y = (y1 + y2) / 2
     
-    # Create a bounding box centered on the leg center
+    # Create a bounding box centered on the leg center (the center of the final image)
     # This ensures we have enough coverage regardless of leg orientation
     min_x = center_x - half_width
     max_x = center_x + half_width
     min_y = center_y - half_height
     max_y = center_y + half_height
     
-    logger.debug(f"Bounding box: center=({center_x:.2f}, {center_y:.2f}), "
-                 f"dimensions=({2*half_width:.2f}m x {2*half_height:.2f}m)")
+    logger.debug("Bounding box: center=(%.2f, %.2f), dimensions=(%.2fm x %.2fm)",
+                 center_x, center_y, 2*half_width, 2*half_height)
     
     return (min_x, min_y, max_x, max_y)
 
 
-def _rotate_image(image: Image.Image, angle_deg: float, center: Tuple[int, int]) -> Image.Image:
+def _scale_composite(
+    composite: Image.Image,
+    size: Tuple[int, int],
+    box: Optional[Tuple[float, float, float, float]] = None
+) -> Image.Image:
+    """
+    Resize the tile composite (or a region of it) to the page resolution.
+    
+    Downscaling uses Pillow's antialiased bilinear filter, box-reducing first
+    when shrinking by more than half. Upscaling (short legs beyond the most
+    detailed zoom level) keeps LANCZOS so that map text stays sharp.
+    
+    Args:
+        composite: Assembled tile composite
+        size: Target size (width, height)
+        box: Region of the composite to resize (whole composite if None);
+            pixels match the same region of a full resize, up to rounding
+        
+    Returns:
+        Resized PIL Image
+    """
+    if box is None:
+        box = (0, 0, composite.width, composite.height)
+    if size[0] > box[2] - box[0] or size[1] > box[3] - box[1]:
+        return composite.resize(size, Image.Resampling.LANCZOS, box=box)
+    return composite.resize(size, Image.Resampling.BILINEAR, box=box, reducing_gap=2.0)
+
+
+def _frame_footprint(
+    angle_deg: float,
+    center: Tuple[float, float],
+    frame_center: Tuple[float, float],
+    size: Tuple[int, int]
+) -> List[Tuple[float, float]]:
+    """
+    Return the corners of the output frame of _rotate_into_frame mapped onto the source image.
+    
+    Args:
+        angle_deg, center, frame_center, size: see _rotate_into_frame
+        
+    Returns:
+        The four corners in source pixels, in polygon order
+    """
+    angle_rad = math.radians(angle_deg)
+    cos_a = math.cos(angle_rad)
+    sin_a = math.sin(angle_rad)
+    cx, cy = center
+    ox, oy = frame_center
+    return [
+        (cos_a * (x - ox) - sin_a * (y - oy) + cx, sin_a * (x - ox) + cos_a * (y - oy) + cy)
+        for x, y in ((0, 0), (size[0], 0), size, (0, size[1]))
+    ]
+
+
+def _frame_source_box(
+    angle_deg: float,
+    center: Tuple[float, float],
+    frame_center: Tuple[float, float],
+    size: Tuple[int, int],
+    image_size: Tuple[int, int],
+    margin: int = 3
+) -> Tuple[int, int, int, int]:
+    """
+    Return the region of an image that _rotate_into_frame samples.
+    
+    This is the bounding box of the output frame mapped back onto the source
+    image, grown by a margin for the resampling filter taps and clamped to
+    the image.
+    
+    Args:
+        angle_deg, center, frame_center, size: see _rotate_into_frame
+        image_size: Size (width, height) of the source image
+        margin: Pixels added on each side
+        
+    Returns:
+        Integer box (left, top, right, bottom) in source pixels
+    """
+    corners = _frame_footprint(angle_deg, center, frame_center, size)
+    xs = [x for x, _ in corners]
+    ys = [y for _, y in corners]
+    left = min(max(math.floor(min(xs)) - margin, 0), image_size[0] - 1)
+    top = min(max(math.floor(min(ys)) - margin, 0), image_size[1] - 1)
+    right = max(min(math.ceil(max(xs)) + margin, image_size[0]), left + 1)
+    bottom = max(min(math.ceil(max(ys)) + margin, image_size[1]), top + 1)
+    return left, top, right, bottom
+
+
+def _tiles_under_footprint(
+    footprint: Sequence[Tuple[float, float]],
+    tile_bounds: Tuple[int, int, int, int],
+    margin: float
+) -> FrozenSet[Tuple[int, int]]:
     """
-    Rotate image around a center point.
+    Return the tiles of a tile range that a convex footprint overlaps.
+    
+    Uses a separating axis test between each tile cell and the footprint:
+    the cell axes and the edge normals of the footprint.
+    
+    Args:
+        footprint: Corners of a convex polygon, in order, in pixels of the
+            composite of the tile range
+        tile_bounds: (min_tile_x, min_tile_y, max_tile_x, max_tile_y)
+        margin: Pixels the footprint is grown by (resampling filter taps)
+        
+    Returns:
+        Set of (tile_x, tile_y)
+    """
+    min_tile_x, min_tile_y, max_tile_x, max_tile_y = tile_bounds
+    fp_min_x = min(x for x, _ in footprint) - margin
+    fp_max_x = max(x for x, _ in footprint) + margin
+    fp_min_y = min(y for _, y in footprint) - margin
+    fp_max_y = max(y for _, y in footprint) + margin
+    # Unit edge normals of the footprint, with its extent along each of them
+    normals = []
+    corners = list(footprint)
+    for (x0, y0), (x1, y1) in zip(corners, corners[1:] + corners[:1]):
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length > 0:
+            nx, ny = (y0 - y1) / length, (x1 - x0) / length
+            extent = [nx * x + ny * y for x, y in footprint]
+            normals.append((nx, ny, min(extent) - margin, max(extent) + margin))
+    
+    tiles = set()
+    for ty in range(min_tile_y, max_tile_y + 1):
+        top = (ty - min_tile_y) * TILE_SIZE
+        bottom = top + TILE_SIZE
+        if bottom < fp_min_y or top > fp_max_y:
+            continue
+        for tx in range(min_tile_x, max_tile_x + 1):
+            left = (tx - min_tile_x) * TILE_SIZE
+            right = left + TILE_SIZE
+            if right < fp_min_x or left > fp_max_x:
+                continue
+            corners = ((left, top), (right, top), (right, bottom), (left, bottom))
+            if all(
+                max(nx * x + ny * y for x, y in corners) >= low and min(nx * x + ny * y for x, y in corners) <= high
+                for nx, ny, low, high in normals
+            ):
+                tiles.add((tx, ty))
+    return frozenset(tiles)
+
+
+def _rotate_into_frame(
+    image: Image.Image,
+    angle_deg: float,
+    center: Tuple[float, float],
+    frame_center: Tuple[float, float],
+    size: Tuple[int, int],
+    resample: Optional[Image.Resampling] = None,
+    source_scale: Tuple[float, float] = (1.0, 1.0)
+) -> Image.Image:
+    """
+    Rotate image around a center point, directly into an output frame.
+    
+    Equivalent to rotating with expand=True and then cropping, but samples the
+    source once into an image of the final size: no intermediate expanded
+    image is allocated.
     
     Args:
         image: PIL Image to rotate
         angle_deg: Rotation angle in degrees (positive = counterclockwise)
-        center: Center point (x, y) in pixels
+        center: Center point (x, y) of the rotation in source pixels
+        frame_center: Where the rotation center lands in the output frame
+        size: Size (width, height) of the output frame
+        resample: Resampling filter (ROTATE_RESAMPLE if None). The composite is
+            already scaled to the output resolution, so bilinear is enough for
+            a pure rotation
+        source_scale: Image pixels per unit of the coordinates center is
+            given in (x, y), to scale the image as part of the rotation
         
     Returns:
-        Rotated PIL Image (with expand=True to prevent clipping)
+        Rotated PIL Image of the given size (black outside the source)
     """
-    # Rotate with expand=True to ensure no clipping
-    # This creates a larger image that contains the rotated content
-    rotated = image.rotate(angle_deg, center=center, expand=True, fillcolor='black', resample=Image.Resampling.BICUBIC)
-    return rotated
+    # Inverse mapping (output pixel → source pixel), as PIL's rotate builds it
+    angle_rad = math.radians(angle_deg)
+    cos_a = math.cos(angle_rad)
+    sin_a = math.sin(angle_rad)
+    cx, cy = center
+    ox, oy = frame_center
+    sx, sy = source_scale
+    matrix = (
+        sx * cos_a, -sx * sin_a, sx * (cx - cos_a * ox + sin_a * oy),
+        sy * sin_a, sy * cos_a, sy * (cy - sin_a * ox - cos_a * oy),
+    )
+    return image.transform(size, Image.Transform.AFFINE, matrix, resample=resample if resample is not None else ROTATE_RESAMPLE, fillcolor='black')
 
 
-def _tm_to_pixel_on_rotated_image(
-    x_tm: float,
-    y_tm: float,
+def _build_tm_to_rotated_affine(
     bbox_tm: Tuple[float, float, float, float],
     map_info: MapInfo,
     zoom: int,
@@ -577,98 +1129,209 @@ def _tm_to_pixel_on_rotated_image(
     original_composite_size: Tuple[int, int],
     rotated_image_size: Tuple[int, int],
     scale_factor: float = 1.0
-) -> Tuple[float, float]:
+) -> np.ndarray:
     """
-    Convert Transverse Mercator coordinates (in meters) to pixel coordinates on a rotated image.
+    Build the affine matrix mapping Transverse Mercator coordinates to pixels on a rotated image.
     
-    This function handles the full transformation chain:
+    The whole chain of _tm_to_pixel_on_rotated_image only depends on the
+    composite and its rotation, so it collapses to one (2, 3) matrix M with
+    (px, py) = M @ (x_tm, y_tm, 1). Build it once per image and apply it to
+    every point:
     1. TM coordinates → pixel coordinates in original composite
     2. Apply scaling if scale_factor != 1.0
     3. Apply rotation transformation around the rotation center
-    4. Account for image expansion offset (when expand=True is used)
+    4. Place the rotation center at the center of the rotated image
     
     Args:
-        x_tm, y_tm: Transverse Mercator coordinates in meters
         bbox_tm: Bounding box in Transverse Mercator (min_x, min_y, max_x, max_y)
         map_info: MapInfo object
         zoom: Zoom level used for the composite
         rotation_angle_deg: Rotation angle in degrees (positive = counterclockwise)
         rotation_center_orig: Rotation center point (x, y) in original composite pixel coordinates
         original_composite_size: Size (width, height) of the original composite before rotation
-        rotated_image_size: Size (width, height) of the rotated image after expansion
+        rotated_image_size: Size (width, height) of the rotated image (or output frame)
         scale_factor: Scale factor applied to the composite (default 1.0)
         
     Returns:
-        Tuple of (x, y) pixel coordinates in the rotated image
+        (2, 3) affine matrix
     """
-    # Step 1: Convert TM coordinates to pixel coordinates in the original composite
-    transformer = _transformer_for_projection(map_info)
-    grid_origin_x, grid_origin_y = transformer.transform(map_info.origin_lon, map_info.origin_lat)
-    resolution = _get_resolution_for_zoom(map_info, zoom)
+    # Step 1: TM → pixel in the scaled composite: px = k*x + tx, py = -k*y + ty
+    # (Y is flipped: TM Y increases north, pixel Y increases down)
+    grid_origin_x, grid_origin_y, _, _ = _grid_corners_tm(map_info)
     # Account for scaling: effective resolution = resolution / scale_factor
-    effective_resolution = resolution / scale_factor
-    
-    # Get tile bounds for the original composite
+    effective_resolution = _get_resolution_for_zoom(map_info, zoom) / scale_factor
+    k = 1 / effective_resolution
+    # Composite-local offset (tile positions also need to account for scaling)
     min_tile_x, min_tile_y, _, _ = _bbox_tm_to_tile_bounds(bbox_tm, map_info, zoom)
+    tx = -grid_origin_x * k - min_tile_x * TILE_SIZE * scale_factor
+    ty = grid_origin_y * k - min_tile_y * TILE_SIZE * scale_factor
     
-    # Convert TM to pixel coordinates in the full tile grid
-    # Use effective resolution which accounts for scaling
-    px_x_full = (x_tm - grid_origin_x) / effective_resolution
-    px_y_full = (grid_origin_y - y_tm) / effective_resolution  # Flip Y (TM Y increases north, pixel Y increases down)
-    
-    # Convert to composite-local pixel coordinates
-    # Note: tile positions also need to account for scaling
-    px_x_orig = px_x_full - (min_tile_x * TILE_SIZE * scale_factor)
-    px_y_orig = px_y_full - (min_tile_y * TILE_SIZE * scale_factor)
-    
-    # Step 2: Apply rotation transformation
-    # PIL rotates the image counterclockwise by rotation_angle_deg.
-    # To find where a point from the original image is in the rotated image,
-    # we rotate the point counterclockwise by the same angle.
+    # Step 2: the image is rotated counterclockwise by rotation_angle_deg around
+    # the rotation center, which lands at the center of the rotated image
+    # (as PIL does with expand=True).
     angle_rad = -math.radians(rotation_angle_deg)
-    
-    # Get rotation center (should be in the scaled composite coordinate system)
-    cx, cy = rotation_center_orig
-    
-    # Translate point relative to rotation center
-    rel_x = px_x_orig - cx
-    rel_y = px_y_orig - cy
-    
-    # Apply rotation matrix (counterclockwise rotation)
     cos_a = math.cos(angle_rad)
     sin_a = math.sin(angle_rad)
-    rotated_rel_x = rel_x * cos_a - rel_y * sin_a
-    rotated_rel_y = rel_x * sin_a + rel_y * cos_a
-    
-    # Translate back and account for image expansion
-    # When PIL rotates with center=(cx, cy) and expand=True, PIL:
-    # 1. Calculates the bounding box needed for the rotated image
-    # 2. Creates a new image of that size
-    # 3. Places the rotated center point at the center of the new image
-    # So the center (cx, cy) maps to (new_w/2, new_h/2)
+    cx, cy = rotation_center_orig
     new_w, new_h = rotated_image_size
     
-    # PIL places the rotated center at the center of the expanded image
-    new_cx = new_w / 2
-    new_cy = new_h / 2
+    return np.array([
+        [cos_a * k, sin_a * k, cos_a * (tx - cx) - sin_a * (ty - cy) + new_w / 2],
+        [sin_a * k, -cos_a * k, sin_a * (tx - cx) + cos_a * (ty - cy) + new_h / 2],
+    ])
+
+
+def _project_tm_points(tm_xy: np.ndarray, affine: np.ndarray) -> np.ndarray:
+    """
+    Apply an affine from _build_tm_to_rotated_affine to many points at once.
+    
+    Args:
+        tm_xy: (N, 2) array of projected coordinates in meters
+        affine: (2, 3) affine matrix
+        
+    Returns:
+        (N, 2) array of pixel coordinates
+    """
+    # Same operation order as the scalar a * x + b * y + c, so results match it exactly
+    return tm_xy[:, :1] * affine[:, 0] + tm_xy[:, 1:] * affine[:, 1] + affine[:, 2]
+
+
+@dataclass(frozen=True)
+class _ProjectedAnchors:
+    """
+    The points most annotations are anchored on, projected once per flight plan.
+
+    These are the turnpoints, the straigthening points and the turn centres
+    (the first route_count anchors), followed by the plan objects drawn on
+    every page; shared by the leg maps and the overview page of a kneeboard.
+    """
+    transformer: Transformer
+    lats: List[float]
+    lons: List[float]
+    xs: List[float]
+    ys: List[float]
+    index: Dict[Tuple[float, float], int]
+    route_count: int
+
+    def xy(self, lat: float, lon: float) -> Tuple[float, float]:
+        """Return the projected coordinates of a point, projecting it if it is not an anchor."""
+        i = self.index.get((lat, lon))
+        if i is None:
+            return self.transformer.transform(lon, lat)
+        return self.xs[i], self.ys[i]
+
+
+def _project_anchors(flight_plan: FlightPlan, flight_plan_data: FlightPlanData, transformer: Transformer) -> _ProjectedAnchors:
+    """Project all the annotation anchors of the flight plan in a single transform call."""
+    lats = [pt.lat for pt in flight_plan.points]
+    lons = [pt.lon for pt in flight_plan.points]
+    for leg in flight_plan_data.legData:
+        lats.append(leg.straigthening_point.lat)
+        lons.append(leg.straigthening_point.lon)
+        # First leg has a dummy turn centre at (0, 0) – skip it.
+        if leg.turn_data.center.lat != 0 or leg.turn_data.center.lon != 0:
+            lats.append(leg.turn_data.center.lat)
+            lons.append(leg.turn_data.center.lon)
+    route_count = len(lats)
+    # Library objects and markers are drawn on every page as well
+    snapshot_map = {e.id: e for e in flight_plan.librarySnapshot or []}
+    for ref in flight_plan.libraryRefs or []:
+        entry = snapshot_map.get(ref.uuid)
+        if entry:
+            lats.append(entry.lat)
+            lons.append(entry.lon)
+    for marker in flight_plan.markers or []:
+        lats.append(marker.lat)
+        lons.append(marker.lon)
+    xs, ys = transformer.transform(lons, lats)
+    index = {}
+    for i, key in enumerate(zip(lats, lons)):
+        index.setdefault(key, i)
+    return _ProjectedAnchors(transformer, lats, lons, list(xs), list(ys), index, route_count)
+
+
+def _coord_to_pixel_mapper(
+    anchors: _ProjectedAnchors,
+    affine: np.ndarray
+) -> Callable[[float, float], Tuple[float, float]]:
+    """
+    Return a function converting geographic coordinates to pixels with the given affine.
     
-    # Final coordinates in rotated image
-    px_x_rot = rotated_rel_x + new_cx
-    px_y_rot = rotated_rel_y + new_cy
+    The anchor points are mapped to pixels in one batch up front and served
+    from a lookup; any other point (ticks, arcs, ring points) goes through the
+    transformer. Callers with many points (threat rings) can use the
+    ``many(lats, lons)`` attribute to project them in one transformer call.
+    """
+    transformer = anchors.transformer
+    pixels = _project_tm_points(np.column_stack([anchors.xs, anchors.ys]), affine).tolist()
+    anchor_pixels = {(lat, lon): (px, py) for lat, lon, (px, py) in zip(anchors.lats, anchors.lons, pixels)}
+    (a, b, c), (d, e, f) = affine.tolist()
+
+    def coord_to_pixel(lat: float, lon: float) -> Tuple[float, float]:
+        """Convert geographic coordinates to pixel coordinates on the image."""
+        pixel = anchor_pixels.get((lat, lon))
+        if pixel is not None:
+            return pixel
+        x_proj, y_proj = transformer.transform(lon, lat)
+        return a * x_proj + b * y_proj + c, d * x_proj + e * y_proj + f
+
+    def many(lats: List[float], lons: List[float]) -> List[Tuple[float, float]]:
+        """Convert a batch of geographic coordinates with a single transformer call."""
+        xs, ys = transformer.transform(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+        return list(map(tuple, _project_tm_points(np.column_stack([xs, ys]), affine).tolist()))
+
+    coord_to_pixel.many = many
+    return coord_to_pixel
+
+
+def _tm_to_pixel_on_rotated_image(
+    x_tm: Union[float, np.ndarray],
+    y_tm: Union[float, np.ndarray],
+    bbox_tm: Tuple[float, float, float, float],
+    map_info: MapInfo,
+    zoom: int,
+    rotation_angle_deg: float,
+    rotation_center_orig: Tuple[int, int],
+    original_composite_size: Tuple[int, int],
+    rotated_image_size: Tuple[int, int],
+    scale_factor: float = 1.0
+) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+    """
+    Convert Transverse Mercator coordinates (in meters) to pixel coordinates on a rotated image.
     
-    logger.debug(f"TM to rotated pixel: TM=({x_tm:.1f}, {y_tm:.1f}) -> "
-                 f"orig_px=({px_x_orig:.1f}, {px_y_orig:.1f}), "
-                 f"rel_to_center=({rel_x:.1f}, {rel_y:.1f}), "
-                 f"rotated_rel=({rotated_rel_x:.1f}, {rotated_rel_y:.1f}), "
-                 f"final=({px_x_rot:.1f}, {px_y_rot:.1f})")
+    Convenience wrapper around _build_tm_to_rotated_affine; when converting
+    points on the same image in several calls, build the matrix once instead.
     
-    return px_x_rot, px_y_rot
+    Args:
+        x_tm, y_tm: Transverse Mercator coordinates in meters (scalars or arrays)
+        (others): see _build_tm_to_rotated_affine
+        
+    Returns:
+        Tuple of (x, y) pixel coordinates in the rotated image, as floats for
+        scalar input and as arrays of the input shape otherwise
+    """
+    (a, b, c), (d, e, f) = _build_tm_to_rotated_affine(
+        bbox_tm, map_info, zoom,
+        rotation_angle_deg, rotation_center_orig,
+        original_composite_size, rotated_image_size,
+        scale_factor
+    ).tolist()
+    if np.ndim(x_tm) == 0 and np.ndim(y_tm) == 0:
+        px_x_rot = a * x_tm + b * y_tm + c
+        px_y_rot = d * x_tm + e * y_tm + f
+        logger.debug("TM to rotated pixel: TM=(%.1f, %.1f) -> final=(%.1f, %.1f)", x_tm, y_tm, px_x_rot, px_y_rot)
+        return px_x_rot, px_y_rot
+    x_tm = np.asarray(x_tm, dtype=np.float64)
+    y_tm = np.asarray(y_tm, dtype=np.float64)
+    logger.debug("TM to rotated pixel: %d points", np.broadcast(x_tm, y_tm).size)
+    return a * x_tm + b * y_tm + c, d * x_tm + e * y_tm + f
 
 def generate_leg_map(
     flight_plan: FlightPlan,
     flight_plan_data: FlightPlanData,
     leg_index: int,
-    details: set[str] = None
+    details: set[str] = None,
+    anchors: Optional[_ProjectedAnchors] = None
 ) -> bytes:
     """
     Generate a map image for a single leg of the flight plan.
@@ -677,6 +1340,8 @@ def generate_leg_map(
         flight_plan: The flight plan
         flight_plan_data: The flight plan data
         leg_index: Index of the leg to generate the map for
+        anchors: Projected anchors of the flight plan, shared between the
+            pages of a kneeboard (projected here if not given)
         
     Returns:
         PNG image data as bytes (768x1024)
@@ -693,17 +1358,15 @@ def generate_leg_map(
     logger.info(f"=== Starting leg map generation ===")
     logger.info(f"Leg: {leg_index}")
 
-    # Calculate direct leg distance
-    real_world_leg_distance = _calculate_distance_meters(
-        origin.lat, origin.lon,
-        destination.lat, destination.lon
-    )
     # Calculate leg distance in the projection (for Mercator compatibility)
-    transformer = _transformer_for_projection(map_info)
-    origin_x_tm, origin_y_tm = transformer.transform(origin.lon, origin.lat)
-    dest_x_tm, dest_y_tm = transformer.transform(destination.lon, destination.lat)
+    # The leg end points and the straigthening point are projected with the other anchors
+    if anchors is None:
+        anchors = _project_anchors(flight_plan, flight_plan_data, _transformer_for_projection(map_info))
+    origin_x_tm, origin_y_tm = anchors.xy(origin.lat, origin.lon)
+    dest_x_tm, dest_y_tm = anchors.xy(destination.lat, destination.lon)
+    straight_x_tm, straight_y_tm = anchors.xy(straigthening_point.lat, straigthening_point.lon)
     leg_distance = math.sqrt((dest_x_tm - origin_x_tm)**2 + (dest_y_tm - origin_y_tm)**2)
-    logger.info(f"Leg distance: {leg_distance:.2f} meters ({leg_distance/1852:.2f} NM) (real world: {real_world_leg_distance:.2f} meters)")
+    logger.info(f"Leg distance: {leg_distance:.2f} meters ({leg_distance/1852:.2f} NM) (flight plan: {leg_data.distanceNm:.2f} NM)")
     
     # Select zoom level (just above 70% height)
     zoom, leg_height_px = _select_zoom_level(map_info, leg_distance)
@@ -714,62 +1377,40 @@ def generate_leg_map(
     scale_factor = target_height_px / leg_height_px
     logger.info(f"Scale factor: {scale_factor:.4f} (to achieve {target_height_px:.1f} px leg height)")
     
-    # Create bounding box around leg (accounting for scaling)
-    bbox_tm = _create_bbox_around_leg(
-        origin.lat, origin.lon,
-        destination.lat, destination.lon,
+    # Create bounding box around the straight part of the leg, which the final
+    # image is centered on (accounting for scaling)
+    bbox_tm = _bbox_around_projected_leg(
+        straight_x_tm, straight_y_tm,
+        dest_x_tm, dest_y_tm,
         zoom, map_info,
         scale_factor
     )
     logger.info(f"Bounding box created: {bbox_tm}")
     
-    # Assemble tiles
-    composite = _assemble_tiles(map_info, zoom, bbox_tm)
+    # Size of the tile composite, assembled once the page footprint is known
+    tile_bounds = _bbox_tm_to_tile_bounds(bbox_tm, map_info, zoom)
+    composite_width = (tile_bounds[2] - tile_bounds[0] + 1) * TILE_SIZE
+    composite_height = (tile_bounds[3] - tile_bounds[1] + 1) * TILE_SIZE
     
-    # Scale the composite before rotation to make leg exactly 70% of height
-    if scale_factor != 1.0:
-        new_width = int(composite.width * scale_factor)
-        new_height = int(composite.height * scale_factor)
-        logger.info(f"Scaling composite from {composite.width}x{composite.height} to {new_width}x{new_height}")
-        composite = composite.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    # The composite is scaled before rotation to make leg exactly 70% of height.
+    # Only the region the rotated page samples gets scaled (see below).
+    scaled_width = int(composite_width * scale_factor)
+    scaled_height = int(composite_height * scale_factor)
     
     # Calculate the angle of the leg line in pixel/image coordinates
     # This is the straight part of the leg, excluding the turn.
-    # We need to use the projected coordinates converted to pixels
-    origin_x_tm, origin_y_tm = transformer.transform(straigthening_point.lon, straigthening_point.lat)
-    dest_x_tm, dest_y_tm = transformer.transform(destination.lon, destination.lat)
-    
-    # Convert to pixel coordinates in the scaled composite
-    grid_origin_x, grid_origin_y = transformer.transform(map_info.origin_lon, map_info.origin_lat)
-    resolution = _get_resolution_for_zoom(map_info, zoom)
-    # Account for scaling: effective resolution in scaled composite
-    effective_resolution = resolution / scale_factor
-    
-    # Get tile bounds for the composite
-    min_tile_x, min_tile_y, _, _ = _bbox_tm_to_tile_bounds(bbox_tm, map_info, zoom)
-    
-    # Convert TM to pixel coordinates using effective resolution (accounts for scaling)
-    origin_px_x = (origin_x_tm - grid_origin_x) / effective_resolution
-    origin_px_y = (grid_origin_y - origin_y_tm) / effective_resolution  # Flip Y
-    dest_px_x = (dest_x_tm - grid_origin_x) / effective_resolution
-    dest_px_y = (grid_origin_y - dest_y_tm) / effective_resolution  # Flip Y
-    
-    # Convert to composite-local pixel coordinates (tile positions also scaled)
-    origin_x_px = origin_px_x - (min_tile_x * TILE_SIZE * scale_factor)
-    origin_y_px = origin_px_y - (min_tile_y * TILE_SIZE * scale_factor)
-    dest_x_px = dest_px_x - (min_tile_x * TILE_SIZE * scale_factor)
-    dest_y_px = dest_px_y - (min_tile_y * TILE_SIZE * scale_factor)
-    
-    # Calculate the angle of the leg line in pixel coordinates
+    # The composite is the projection scaled by a positive factor with Y
+    # flipped, so the leg angle in pixels follows from the projected
+    # coordinates directly: the scale cancels out in atan2.
     # In PIL coordinates: (0,0) is top-left, x increases right, y increases down
     # atan2(y, x) gives angle where 0° = right, 90° = down, -90° = up, 180° = left
-    dx = dest_x_px - origin_x_px
-    dy = dest_y_px - origin_y_px
+    dx = dest_x_tm - straight_x_tm
+    dy = straight_y_tm - dest_y_tm  # Flip Y
     leg_angle_rad = math.atan2(dy, dx)
     leg_angle_deg = 90 + math.degrees(leg_angle_rad)
     if leg_angle_deg < 0:
         leg_angle_deg = 360 + leg_angle_deg
-    logger.info(f"Leg angle in pixel coordinates: {leg_angle_deg:.2f}° (dx={dx:.1f}, dy={dy:.1f})")
+    logger.info(f"Leg angle in pixel coordinates: {leg_angle_deg:.2f}° (dx={dx:.1f}m, dy={dy:.1f}m)")
     
     # Rotate so leg is vertical (pointing north/up)
     # In PIL coordinates: -90° = up (north), 0° = right (east), 90° = down (south), 180° = left (west)
@@ -778,112 +1419,91 @@ def generate_leg_map(
     logger.info(f"Rotation angle: {rotation_angle:.2f}° (to make leg point up at -90°)")
     
     # Get center of scaled composite image (before rotation)
-    center_x = composite.width // 2
-    center_y = composite.height // 2
-    logger.info(f"Scaled composite image size: {composite.width}x{composite.height}, center: ({center_x}, {center_y})")
+    center_x = scaled_width // 2
+    center_y = scaled_height // 2
+    logger.info(f"Scaled composite image size: {scaled_width}x{scaled_height}, center: ({center_x}, {center_y})")
     
     # Store scaled composite size before rotation
-    scaled_composite_size = (composite.width, composite.height)
+    scaled_composite_size = (scaled_width, scaled_height)
     
-    # Rotate image (with expand=True to prevent clipping)
-    logger.info(f"Rotating image by {rotation_angle:.2f}° around center ({center_x}, {center_y})")
-    rotated = _rotate_image(composite, rotation_angle, (center_x, center_y))
-    logger.info(f"Rotated image size: {rotated.width}x{rotated.height}")
+    # Affine from the projection to the output frame: rotation center first at
+    # the frame center, then shifted so the leg center lands at the frame center
+    half_width = MAP_WIDTH // 2
+    half_height = MAP_HEIGHT // 2
+    affine = _build_tm_to_rotated_affine(
+        bbox_tm, map_info, zoom,
+        rotation_angle, (center_x, center_y),
+        scaled_composite_size, (MAP_WIDTH, MAP_HEIGHT),
+        scale_factor
+    )
+    (m_a, m_b, m_c), (m_d, m_e, m_f) = affine.tolist()
+    
+    # Find the leg center in the projection coordinates (reuse values calculated earlier)
+    leg_center_x_tm = (straight_x_tm + dest_x_tm) / 2
+    leg_center_y_tm = (straight_y_tm + dest_y_tm) / 2
+    left = int(m_a * leg_center_x_tm + m_b * leg_center_y_tm + m_c - half_width)
+    top = int(m_d * leg_center_x_tm + m_e * leg_center_y_tm + m_f - half_height)
+    affine[:, 2] -= (left, top)
+    frame_center = (MAP_WIDTH / 2 - left, MAP_HEIGHT / 2 - top)
+    
+    # Assemble only the tiles under the rotated page (with a margin for the
+    # resampling filters): the corners of the square bbox are never sampled
+    source_scale = (composite_width / scaled_width, composite_height / scaled_height)
+    footprint = [
+        (x * source_scale[0], y * source_scale[1])
+        for x, y in _frame_footprint(rotation_angle, (center_x, center_y), frame_center, (MAP_WIDTH, MAP_HEIGHT))
+    ]
+    tiles = _tiles_under_footprint(footprint, tile_bounds, math.ceil(8 / min(scale_factor, 1.0)))
+    logger.info(f"Page footprint covers {len(tiles)} of "
+                f"{(tile_bounds[2] - tile_bounds[0] + 1) * (tile_bounds[3] - tile_bounds[1] + 1)} tiles")
+    composite = _assemble_tiles(map_info, zoom, bbox_tm, tiles)
+    
+    # Rotate the composite straight into the MAP_WIDTH x MAP_HEIGHT frame centered on the leg
+    logger.info(f"Rotating image by {rotation_angle:.2f}° around center ({center_x}, {center_y}) "
+                f"into frame, rotation center at ({frame_center[0]:.1f}, {frame_center[1]:.1f})")
+    if FUSED_SCALE_MIN <= scale_factor <= 1.0:
+        # Slight reductions need no antialiasing: scale as part of the rotation
+        cropped = _rotate_into_frame(
+            composite, rotation_angle, (center_x, center_y), frame_center, (MAP_WIDTH, MAP_HEIGHT),
+            source_scale=source_scale
+        )
+    else:
+        # Scale only the part of the composite the rotated page covers: the corners
+        # of the tile grid and of the square bbox around the leg are never sampled
+        crop_left, crop_top, crop_right, crop_bottom = _frame_source_box(
+            rotation_angle, (center_x, center_y), frame_center, (MAP_WIDTH, MAP_HEIGHT), scaled_composite_size
+        )
+        logger.info(f"Scaling composite region ({crop_left}, {crop_top}, {crop_right}, {crop_bottom}) "
+                    f"of {scaled_width}x{scaled_height} (composite {composite.width}x{composite.height})")
+        sx, sy = source_scale
+        composite = _scale_composite(
+            composite, (crop_right - crop_left, crop_bottom - crop_top),
+            box=(crop_left * sx, crop_top * sy, crop_right * sx, crop_bottom * sy)
+        )
+        cropped = _rotate_into_frame(
+            composite, rotation_angle, (center_x - crop_left, center_y - crop_top), frame_center, (MAP_WIDTH, MAP_HEIGHT)
+        )
     
     # Create a converter function that converts lat/lon to pixel coordinates on the rotated image
-    def coord_to_pixel(lat: float, lon: float) -> Tuple[float, float]:
-        """Convert geographic coordinates to pixel coordinates on the rotated image."""
-        x_proj, y_proj = transformer.transform(lon, lat)
-        return _tm_to_pixel_on_rotated_image(
-            x_proj, y_proj,
-            bbox_tm, map_info, zoom,
-            rotation_angle, (center_x, center_y),
-            scaled_composite_size, rotated.size,
-            scale_factor
-        )
+    coord_to_pixel = _coord_to_pixel_mapper(anchors, affine)
+    
+    # All the overlays are composited in RGBA: convert once for all of them
+    cropped = cropped.convert('RGBA')
     
     # Draw the leg onto the rotated image
     annotate_map(
-        rotated,
+        cropped,
         flight_plan,
         flight_plan_data,
         leg_index,
         coord_to_pixel
     )
     
-    # Find the leg center in the rotated image for cropping
-    # Calculate leg center in the projection coordinates (reuse values calculated earlier)
-    leg_center_x_tm = (origin_x_tm + dest_x_tm) / 2
-    leg_center_y_tm = (origin_y_tm + dest_y_tm) / 2
-    
-    # Convert leg center to pixel coordinates on the rotated image
-    leg_center_x_px, leg_center_y_px = _tm_to_pixel_on_rotated_image(
-        leg_center_x_tm, leg_center_y_tm,
-        bbox_tm, map_info, zoom,
-        rotation_angle, (center_x, center_y),
-        scaled_composite_size, rotated.size,
-        scale_factor
-    )
-    logger.info(f"Leg center in rotated image: ({leg_center_x_px:.1f}, {leg_center_y_px:.1f})")
-    
-    # Crop the rotated image to MAP_WIDTH x MAP_HEIGHT, centered on the leg center
-    half_width = MAP_WIDTH // 2
-    half_height = MAP_HEIGHT // 2
-    
-    # Calculate crop box coordinates
-    left = int(leg_center_x_px - half_width)
-    top = int(leg_center_y_px - half_height)
-    right = int(leg_center_x_px + half_width)
-    bottom = int(leg_center_y_px + half_height)
-    
-    # Ensure crop box is within image bounds
-    # If crop box extends outside, shift it inward while keeping the leg centered
-    if left < 0:
-        shift = -left
-        left = 0
-        right += shift
-    if top < 0:
-        shift = -top
-        top = 0
-        bottom += shift
-    if right > rotated.width:
-        shift = right - rotated.width
-        right = rotated.width
-        left = max(0, left - shift)
-    if bottom > rotated.height:
-        shift = bottom - rotated.height
-        bottom = rotated.height
-        top = max(0, top - shift)
-    
-    logger.info(f"Cropping rotated image: box=({left}, {top}, {right}, {bottom}), "
-                f"rotated size={rotated.width}x{rotated.height}")
-    
-    # Crop the image
-    cropped = rotated.crop((left, top, right, bottom))
-    
-    # If the cropped image is smaller than target size (e.g., near edges), pad it
-    if cropped.width < MAP_WIDTH or cropped.height < MAP_HEIGHT:
-        logger.warning(f"Cropped image is smaller than target: {cropped.width}x{cropped.height}, padding to {MAP_WIDTH}x{MAP_HEIGHT}")
-        final_image = Image.new('RGB', (MAP_WIDTH, MAP_HEIGHT), color='black')
-        # Center the cropped image in the final image
-        paste_x = (MAP_WIDTH - cropped.width) // 2
-        paste_y = (MAP_HEIGHT - cropped.height) // 2
-        final_image.paste(cropped, (paste_x, paste_y))
-        cropped = final_image
-    else:
-        # Ensure exact size by resizing if needed (shouldn't happen normally, but handle edge cases)
-        if cropped.width != MAP_WIDTH or cropped.height != MAP_HEIGHT:
-            logger.info(f"Resizing cropped image from {cropped.width}x{cropped.height} to {MAP_WIDTH}x{MAP_HEIGHT}")
-            cropped = cropped.resize((MAP_WIDTH, MAP_HEIGHT), Image.Resampling.LANCZOS)
-    
     # Draw the info box and comment strip in a single overlay pass so the
     # comment strip can be positioned alongside the info box.
     dest_comment = flight_plan.points[leg_index + 1].comment
     has_comment = bool(dest_comment and dest_comment.strip())
     if details or has_comment:
-        from PIL import ImageDraw
-        if cropped.mode != 'RGBA':
-            cropped = cropped.convert('RGBA')
         overlay = Image.new('RGBA', cropped.size, (0, 0, 0, 0))
         overlay_draw = ImageDraw.Draw(overlay)
 
@@ -895,11 +1515,12 @@ def generate_leg_map(
             draw_comment_strip(overlay_draw, dest_comment.strip(), cropped.width, cropped.height, info_box_geom)
 
         cropped = Image.alpha_composite(cropped, overlay)
-        cropped = cropped.convert('RGB')
+
+    cropped = cropped.convert('RGB')
 
     # Save cropped image as PNG
     img_byte_arr = io.BytesIO()
-    cropped.save(img_byte_arr, format='PNG')
+    cropped.save(img_byte_arr, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
     img_bytes = img_byte_arr.getvalue()
     logger.info(f"Generated cropped PNG: {len(img_bytes)} bytes")
     time_taken = time.time() - start_time
@@ -6,6 +6,7 @@ from flight_plan import FlightPlan, ImportFlightPlanRequest
 from task_queue import get_task_queue
 import os
 import logging
+import PIL
 from typing import Optional
 
 # Set up centralized logging configuration
@@ -24,6 +25,8 @@ cors_origins_env = os.getenv("CORS_ORIGINS", "http://localhost:5173")
 cors_origins = [origin.strip() for origin in cors_origins_env.split(",")]
 
 logger.info(f"CORS allowed origins: {cors_origins}")
+# pillow-simd releases are versioned X.Y.Z.postN (see DEPLOYMENT.md)
+logger.info(f"Pillow {PIL.__version__}{' (SIMD build)' if '.post' in PIL.__version__ else ''}")
 
 # Add CORS middleware to allow cross-origin requests
 app.add_middleware(
@@ -73,7 +73,7 @@ def _load_fonts() -> Tuple[
             medium_font = ImageFont.truetype(font_path, medium_size)
             # medium_font.set_variation_by_name('Bold')
             small_font = ImageFont.truetype(font_path, small_size)
-            logger.debug(f"Loaded fonts from {font_path}")
+            logger.debug("Loaded fonts from %s", font_path)
             return large_font, medium_font, small_font
         except (OSError, IOError) as e:
             logger.warning(f"Failed to load font from {font_path}: {e}")
@@ -88,10 +88,34 @@ def _load_fonts() -> Tuple[
 # Load fonts once at module level for reuse across all annotation functions
 LARGE_FONT, MEDIUM_FONT, SMALL_FONT = _load_fonts()
 
+# Scratch draw context used only to measure text, shared instead of allocating an image per label
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
 
 TURNPOINT_RADIUS = 12
 
 
+def _clamp_px(val: float, size: int) -> float:
+    """Clamp a pixel coordinate to the image extended by its own size on each side.
+
+    Points just off the image keep their position and are clipped when drawn;
+    only far-away points are pulled in, so drawing never uses huge coordinates.
+    """
+    return max(-size, min(val, 2 * size - 1))
+
+
+def _clamp_segment_px(
+    x1: float, y1: float, x2: float, y2: float, image_width: int, image_height: int
+) -> Tuple[float, float, float, float]:
+    """Clamp both ends of a segment with _clamp_px (bounds computed once)."""
+    lo_x, hi_x = -image_width, 2 * image_width - 1
+    lo_y, hi_y = -image_height, 2 * image_height - 1
+    return (
+        max(lo_x, min(x1, hi_x)), max(lo_y, min(y1, hi_y)),
+        max(lo_x, min(x2, hi_x)), max(lo_y, min(y2, hi_y)),
+    )
+
+
 def draw_turnpoint(
     draw: ImageDraw.ImageDraw,
     point: FlightPlanTurnPoint,
@@ -125,12 +149,9 @@ def draw_turnpoint(
     try:
         x_px, y_px = coord_to_pixel(point.lat, point.lon)
 
-        # Clamp to image bounds
-        def _clamp(val, lo, hi):
-            return max(lo, min(val, hi))
-
-        x = _clamp(x_px, 0, image_width - 1)
-        y = _clamp(y_px, 0, image_height - 1)
+        # Clamp far-away points around the image bounds
+        x = _clamp_px(x_px, image_width)
+        y = _clamp_px(y_px, image_height)
 
         wpt_type = point.waypointType or "normal"
         r = TURNPOINT_RADIUS
@@ -197,7 +218,7 @@ def draw_turnpoint(
             if not halo_only:
                 draw.ellipse((x - r, y - r, x + r, y + r), outline=color, width=stroke)
 
-        logger.debug(f"Drew turnpoint ({wpt_type}) at ({x_px:.1f}, {y_px:.1f})")
+        logger.debug("Drew turnpoint (%s) at (%.1f, %.1f)", wpt_type, x_px, y_px)
     except Exception as e:
         logger.warning(f"Failed to draw turnpoint: {e}")
 
@@ -330,7 +351,7 @@ def draw_leg(
             turn_radius_px = math.sqrt(
                 (sx - center_x_px) ** 2 + (sy - center_y_px) ** 2
             )
-            logger.debug(f"turn_radius_px: {turn_radius_px:.1f}")
+            logger.debug("turn_radius_px: %.1f", turn_radius_px)
 
             # Calculate angles from turn center to intersection point and straightening point
             # Pillow's draw.arc uses: 0° = 3 o'clock (east), angles increase counterclockwise
@@ -340,7 +361,7 @@ def draw_leg(
             angle_end = (
                 math.degrees(math.atan2(sy - center_y_px, sx - center_x_px)) % 360
             )
-            logger.debug(f"angle_start: {angle_start:.1f}, angle_end: {angle_end:.1f}")
+            logger.debug("angle_start: %.1f, angle_end: %.1f", angle_start, angle_end)
 
             # Pillow draws arcs counterclockwise. If start > end, it still goes counterclockwise
             # which means it takes the long way. To get the shorter arc, we need to ensure
@@ -351,12 +372,12 @@ def draw_leg(
 
             ratio = min(1, circle_radius / turn_radius_px)
             tpcircle_angle = math.degrees(math.asin(ratio))
-            logger.debug(f"Turnpoint circle angle: {tpcircle_angle:.1f}")
+            logger.debug("Turnpoint circle angle: %.1f", tpcircle_angle)
 
             logger.debug(
-                f"Diff forward: {diff_forward:.1f}, Diff backward: {diff_backward:.1f}"
+                "Diff forward: %.1f, Diff backward: %.1f", diff_forward, diff_backward
             )
-            logger.debug(f"Turn angle: {math.degrees(leg_data.turn_angle_rad):.1f}")
+            logger.debug("Turn angle: %.1f", math.degrees(leg_data.turn_angle_rad))
 
             if leg_data.turn_angle_rad < math.pi:
                 if diff_backward < diff_forward:
@@ -376,11 +397,11 @@ def draw_leg(
                 else:
                     angle_start += tpcircle_angle
 
-            logger.debug(f"Angle start before: {angle_start}")
+            logger.debug("Angle start before: %s", angle_start)
             angle_start = round(angle_start, 1) % 360
             angle_end = round(angle_end, 1) % 360
-            logger.debug(f"Angle start before 2: {angle_start}")
-            logger.debug(f"Angle start: {angle_start:.1f}, Angle end: {angle_end:.1f}")
+            logger.debug("Angle start before 2: %s", angle_start)
+            logger.debug("Angle start: %.1f, Angle end: %.1f", angle_start, angle_end)
             if halo:
                 halo_w = line_width + 4
                 halo_alpha = int(color[3] * 0.4)
@@ -446,16 +467,16 @@ def draw_leg(
                     width=line_width,
                 )
             logger.debug(
-                f"Drew straight leg line from ({sx:.1f}, {sy:.1f}) to ({shortened_dx:.1f}, {shortened_dy:.1f})"
+                "Drew straight leg line from (%.1f, %.1f) to (%.1f, %.1f)", sx, sy, shortened_dx, shortened_dy
             )
         else:
             # If the leg is too short, don't draw it
             logger.debug(
-                f"Leg too short to draw (length: {leg_length:.1f}px, need > {2 * circle_radius}px)"
+                "Leg too short to draw (length: %.1fpx, need > %spx)", leg_length, 2 * circle_radius
             )
 
         logger.debug(
-            f"Drew leg overlay on image: O=({ox:.1f},{oy:.1f}) D=({dx:.1f},{dy:.1f})"
+            "Drew leg overlay on image: O=(%.1f,%.1f) D=(%.1f,%.1f)", ox, oy, dx, dy
         )
     except Exception as e:
         logger.warning(
@@ -495,7 +516,7 @@ def annotate_leg(
         return
 
     logger.debug(
-        f"Leg endpoints on image: O=({origin_x_px:.1f}, {origin_y_px:.1f}), D=({dest_x_px:.1f}, {dest_y_px:.1f})"
+        "Leg endpoints on image: O=(%.1f, %.1f), D=(%.1f, %.1f)", origin_x_px, origin_y_px, dest_x_px, dest_y_px
     )
 
     try:
@@ -523,7 +544,7 @@ def annotate_leg(
                 continue
             x = straightening_x_px + dx_per_min * sec_from_straightening / 60
             y = straightening_y_px + dy_per_min * sec_from_straightening / 60
-            logger.debug(f"Minute {minute_s} at {x:.1f} {y:.1f}")
+            logger.debug("Minute %s at %.1f %.1f", minute_s, x, y)
 
             # Calculate perpendicular vector to the leg for tick orientation
             # Perpendicular to (dx, dy) is (-dy, dx) or (dy, -dx)
@@ -570,10 +591,8 @@ def annotate_leg(
                 text_y = y + text_offset_y
 
                 # Create temporary image for rotated text
-                # Estimate text size (small font) - use a temporary image to measure
-                temp_measure = Image.new("RGBA", (100, 100), (0, 0, 0, 0))
-                temp_measure_draw = ImageDraw.Draw(temp_measure)
-                text_bbox = temp_measure_draw.textbbox(
+                # Measure text size (small font) with the shared scratch draw
+                text_bbox = _MEASURE_DRAW.textbbox(
                     (0, 0), label_txt, font=SMALL_FONT
                 )
                 text_width = text_bbox[2] - text_bbox[0]
@@ -619,12 +638,8 @@ def annotate_leg(
                 paste_x = int(text_x - rotated_center_x)
                 paste_y = int(text_y - rotated_center_y)
 
-                # Create temporary overlay and paste rotated text
-                temp_overlay = Image.new("RGBA", overlay_image.size, (0, 0, 0, 0))
-                temp_overlay.paste(rotated_temp, (paste_x, paste_y))
-
-                # Alpha composite onto main overlay
-                overlay_image.paste(Image.alpha_composite(overlay_image, temp_overlay))
+                # Alpha composite the rotated text onto the main overlay
+                overlay_image.alpha_composite(rotated_temp, dest=(paste_x, paste_y))
 
     except Exception as e:
         logger.warning(f"Failed to annotate leg: {e}")
@@ -659,12 +674,9 @@ def annotate_turnpoint(
     try:
         x_px, y_px = coord_to_pixel(point.lat, point.lon)
 
-        # Clamp to image bounds
-        def _clamp(val, lo, hi):
-            return max(lo, min(val, hi))
-
-        x = _clamp(x_px, 0, image_width - 1)
-        y = _clamp(y_px, 0, image_height - 1)
+        # Clamp far-away points around the image bounds
+        x = _clamp_px(x_px, image_width)
+        y = _clamp_px(y_px, image_height)
 
         t_color = text_color if text_color is not None else TEXT_COLOR_RGBA
 
@@ -723,7 +735,7 @@ def annotate_turnpoint(
         if not show_details:
             # Context tier: only show the turnpoint number, skip name/ETA/PUSH labels
             logger.debug(
-                f"Annotated turnpoint {index + 1} (context, number only) at ({x_px:.1f}, {y_px:.1f})"
+                "Annotated turnpoint %s (context, number only) at (%.1f, %.1f)", index + 1, x_px, y_px
             )
             return
 
@@ -792,7 +804,7 @@ def annotate_turnpoint(
             )
 
         logger.debug(
-            f"Annotated turnpoint {index + 1} at ({x_px:.1f}, {y_px:.1f}) with ETA {eta_str}"
+            "Annotated turnpoint %s at (%.1f, %.1f) with ETA %s", index + 1, x_px, y_px, eta_str
         )
     except Exception as e:
         logger.warning(f"Failed to annotate turnpoint: {e}")
@@ -827,14 +839,8 @@ def _calculate_doghouse_position(
     origin_x_px, origin_y_px = coord_to_pixel(origin.lat, origin.lon)
     dest_x_px, dest_y_px = coord_to_pixel(destination.lat, destination.lon)
 
-    # Clamp to image bounds
-    def _clamp(val, lo, hi):
-        return max(lo, min(val, hi))
-
-    ox = _clamp(origin_x_px, 0, image_width - 1)
-    oy = _clamp(origin_y_px, 0, image_height - 1)
-    dx = _clamp(dest_x_px, 0, image_width - 1)
-    dy = _clamp(dest_y_px, 0, image_height - 1)
+    # Clamp far-away points around the image bounds
+    ox, oy, dx, dy = _clamp_segment_px(origin_x_px, origin_y_px, dest_x_px, dest_y_px, image_width, image_height)
 
     # Calculate the direction vector of the leg
     leg_dx = dx - ox
@@ -1207,7 +1213,7 @@ def draw_doghouse(
             line_width,
         )
 
-        logger.debug(f"Drew doghouse for leg at ({ref_x:.1f}, {ref_y:.1f})")
+        logger.debug("Drew doghouse for leg at (%.1f, %.1f)", ref_x, ref_y)
     except Exception as e:
         logger.warning(f"Failed to draw doghouse: {e}")
 
@@ -1263,14 +1269,8 @@ def draw_mini_doghouse(
         )
         dest_x_px, dest_y_px = coord_to_pixel(destination.lat, destination.lon)
 
-        # Clamp to image bounds
-        def _clamp(val, lo, hi):
-            return max(lo, min(val, hi))
-
-        ox = _clamp(origin_x_px, 0, image_width - 1)
-        oy = _clamp(origin_y_px, 0, image_height - 1)
-        dx = _clamp(dest_x_px, 0, image_width - 1)
-        dy = _clamp(dest_y_px, 0, image_height - 1)
+        # Clamp far-away points around the image bounds
+        ox, oy, dx, dy = _clamp_segment_px(origin_x_px, origin_y_px, dest_x_px, dest_y_px, image_width, image_height)
 
         logger.info(f"Origin: ({ox:.1f}, {oy:.1f}), Destination: ({dx:.1f}, {dy:.1f})")
 
@@ -1400,17 +1400,12 @@ def draw_mini_doghouse(
         paste_x = int(doghouse_center_x - rotated_center_x)
         paste_y = int(doghouse_center_y - rotated_center_y)
 
-        # Create a temporary overlay the same size as the main overlay
-        # Paste the rotated doghouse onto it at the correct position
-        temp_overlay = Image.new("RGBA", overlay_image.size, (0, 0, 0, 0))
-        temp_overlay.paste(rotated_temp, (paste_x, paste_y))
-
-        # Alpha composite the temporary overlay onto the main overlay
-        # This properly blends the alpha channels
-        overlay_image.paste(Image.alpha_composite(overlay_image, temp_overlay))
+        # Alpha composite the rotated doghouse onto the main overlay; only the
+        # area under the doghouse is blended (parts off the overlay are clipped)
+        overlay_image.alpha_composite(rotated_temp, dest=(paste_x, paste_y))
 
         logger.debug(
-            f"Drew mini-doghouse for leg at ({ref_x:.1f}, {ref_y:.1f}) with rotation {rotation_angle:.1f}° (leg angle: {leg_angle_deg:.1f}°)"
+            "Drew mini-doghouse for leg at (%.1f, %.1f) with rotation %.1f° (leg angle: %.1f°)", ref_x, ref_y, rotation_angle, leg_angle_deg
         )
     except Exception as e:
         logger.warning(f"Failed to draw mini-doghouse: {e}")
@@ -1540,7 +1535,7 @@ def draw_info_box(
         width=line_width,
     )
 
-    logger.debug(f"Drew info box at ({box_left}, {box_top})")
+    logger.debug("Drew info box at (%s, %s)", box_left, box_top)
     return (box_left, box_top, box_width, total_height)
 
 
@@ -1649,7 +1644,7 @@ def draw_comment_strip(
             font=font,
         )
 
-    logger.debug(f"Drew comment strip at ({strip_left}, {strip_top}): {comment[:40]!r}")
+    logger.debug("Drew comment strip at (%s, %s): %r", strip_left, strip_top, comment[:40])
 
 
 # ── Plan objects (pictograms, threat rings) ────────────────────────────────────
@@ -1742,8 +1737,12 @@ def draw_pictogram(
     ptype: str,
     color: tuple,
     size: int = OBJECT_RADIUS * 2,
+    draw: Optional[ImageDraw.ImageDraw] = None,
 ) -> None:
-    """Composite a rasterized SVG pictogram centred at (x, y) onto an RGBA overlay."""
+    """Composite a rasterized SVG pictogram centred at (x, y) onto an RGBA overlay.
+
+    draw: existing draw context of the overlay, reused for the halo if given.
+    """
     try:
         r, g, b = color[0], color[1], color[2]
         color_hex = f"#{r:02x}{g:02x}{b:02x}"
@@ -1756,12 +1755,12 @@ def draw_pictogram(
         halo_cx = ox + vcx
         halo_cy = oy + vcy
         hr = vr + 2
-        hd = ImageDraw.Draw(overlay)
+        hd = draw if draw is not None else ImageDraw.Draw(overlay)
         hd.ellipse((halo_cx - hr, halo_cy - hr, halo_cx + hr, halo_cy + hr), fill=PICTO_HALO_COLOR)
         # Icon composited on top of the halo
         overlay.alpha_composite(icon, dest=(ox, oy))
     except Exception as e:
-        logger.debug(f"draw_pictogram({ptype}): {e}")
+        logger.debug("draw_pictogram(%s): %s", ptype, e)
 
 
 def draw_plan_objects(
@@ -1836,7 +1835,7 @@ def draw_plan_objects(
                 return
             if py < -OBJECT_RADIUS * 3 or py > h + OBJECT_RADIUS * 3:
                 return
-            draw_pictogram(overlay, px, py, ptype, color=_picto_color(ptype))
+            draw_pictogram(overlay, px, py, ptype, color=_picto_color(ptype), draw=draw)
             text_parts = [p for p in [label, comment] if p]
             if text_parts:
                 text = " · ".join(text_parts)
@@ -1852,7 +1851,7 @@ def draw_plan_objects(
                 )
                 draw.text((tx, ty), text, fill=tcolor, font=SMALL_FONT)
         except Exception as e:
-            logger.debug(f"draw_plan_objects: {e}")
+            logger.debug("draw_plan_objects: %s", e)
 
     # Library refs
     for ref in flight_plan.libraryRefs or []:
@@ -1871,6 +1870,31 @@ def draw_plan_objects(
         )
 
 
+def _coords_to_pixels(
+    coord_to_pixel: Callable[[float, float], Tuple[float, float]],
+    lats: List[float],
+    lons: List[float],
+) -> List[Tuple[float, float]]:
+    """
+    Convert a list of coordinates to pixels, in one batch when the converter supports it.
+
+    Points that cannot be converted are skipped.
+    """
+    many = getattr(coord_to_pixel, "many", None)
+    if many is not None:
+        try:
+            return many(lats, lons)
+        except Exception:
+            pass
+    pixels = []
+    for lat, lon in zip(lats, lons):
+        try:
+            pixels.append(coord_to_pixel(lat, lon))
+        except Exception:
+            pass
+    return pixels
+
+
 def draw_threat_rings(
     draw: ImageDraw.ImageDraw,
     image: Image.Image,
@@ -1889,21 +1913,14 @@ def draw_threat_rings(
         center_lat: float, center_lon: float, range_nm: float, color: tuple
     ) -> None:
         radius_m = range_nm * NM_TO_METERS
-        ring_px = []
-        for i in range(n_points + 1):
-            angle = 2 * math.pi * i / n_points
-            dlat = (radius_m / 111320.0) * math.cos(angle)
-            cos_lat = math.cos(math.radians(center_lat))
-            dlon = (
-                (radius_m / (111320.0 * cos_lat)) * math.sin(angle)
-                if cos_lat > 1e-6
-                else 0.0
-            )
-            try:
-                px, py = coord_to_pixel(center_lat + dlat, center_lon + dlon)
-                ring_px.append((px, py))
-            except Exception:
-                pass
+        angles = 2 * math.pi * _np.arange(n_points + 1) / n_points
+        cos_lat = math.cos(math.radians(center_lat))
+        lats = center_lat + (radius_m / 111320.0) * _np.cos(angles)
+        if cos_lat > 1e-6:
+            lons = center_lon + (radius_m / (111320.0 * cos_lat)) * _np.sin(angles)
+        else:
+            lons = _np.full_like(angles, center_lon)
+        ring_px = _coords_to_pixels(coord_to_pixel, lats.tolist(), lons.tolist())
         if len(ring_px) >= 2:
             ring_color = (*color[:3], 160)
             draw.line(ring_px, fill=ring_color, width=2)
@@ -2090,7 +2107,7 @@ def annotate_map(
             for i, point in enumerate(flight_plan.points):
                 if _tp_tier(i) != tier:
                     continue
-                logger.debug(f"Drawing turnpoint {i} (tier={tier})")
+                logger.debug("Drawing turnpoint %s (tier=%s)", i, tier)
                 draw_turnpoint(
                     overlay_draw,
                     point,
@@ -2183,7 +2200,7 @@ def annotate_map(
             image.paste(image_composited, (0, 0))
 
         logger.debug(
-            f"Annotated map with {len(flight_plan.points)} turnpoints and {max(0, len(flight_plan.points) - 1)} legs"
+            "Annotated map with %s turnpoints and %s legs", len(flight_plan.points), max(0, len(flight_plan.points) - 1)
         )
     except Exception as e:
         logger.warning(f"Failed to annotate map image: {e}")
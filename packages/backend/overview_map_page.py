@@ -8,7 +8,7 @@ symbols, minute marks on legs, a north arrow, and a total distance/time summary.
 import io
 import math
 import logging
-from typing import Tuple
+from typing import Optional
 from PIL import Image, ImageDraw
 
 from flight_plan import FlightPlan, FlightPlanData
@@ -16,11 +16,17 @@ from kneeboard import (
     _get_map_info,
     _transformer_for_projection,
     _get_resolution_for_zoom,
+    _zoom_levels,
     _assemble_tiles,
-    _tm_to_pixel_on_rotated_image,
-    _rotate_image,
+    _scale_composite,
+    _build_tm_to_rotated_affine,
+    _rotate_into_frame,
+    _ProjectedAnchors,
+    _project_anchors,
+    _coord_to_pixel_mapper,
     MAP_WIDTH,
     MAP_HEIGHT,
+    PNG_COMPRESS_LEVEL,
 )
 from map_annotations import (
     annotate_overview_map,
@@ -35,7 +41,11 @@ logger = logging.getLogger(__name__)
 OVERVIEW_FILL_TARGET = 0.85
 
 
-def generate_overview_map_page(flight_plan: FlightPlan, flight_plan_data: FlightPlanData) -> bytes:
+def generate_overview_map_page(
+    flight_plan: FlightPlan,
+    flight_plan_data: FlightPlanData,
+    anchors: Optional[_ProjectedAnchors] = None,
+) -> bytes:
     """
     Generate a 768x1024 PNG overview map showing the entire route.
 
@@ -46,33 +56,20 @@ def generate_overview_map_page(flight_plan: FlightPlan, flight_plan_data: Flight
     Args:
         flight_plan: The flight plan input model.
         flight_plan_data: Pre-computed flight plan data (legs, ETAs, …).
+        anchors: Projected route points shared with the leg maps (projected
+            here if not given).
 
     Returns:
         PNG image bytes (768 x 1024, RGB).
     """
     map_info = _get_map_info(flight_plan.theatre)
-    transformer = _transformer_for_projection(map_info)
 
     # ── Step 1: Compute route bounding box in projected coordinates ──────────
     # Include waypoints, straightening points, and turn centres so that turn
-    # arcs are not clipped at the page edges.
-    all_x: list[float] = []
-    all_y: list[float] = []
-
-    for pt in flight_plan.points:
-        x, y = transformer.transform(pt.lon, pt.lat)
-        all_x.append(x)
-        all_y.append(y)
-
-    for leg in flight_plan_data.legData:
-        x, y = transformer.transform(leg.straigthening_point.lon, leg.straigthening_point.lat)
-        all_x.append(x)
-        all_y.append(y)
-        # First leg has a dummy turn centre at (0, 0) – skip it.
-        if leg.turn_data.center.lat != 0 or leg.turn_data.center.lon != 0:
-            x, y = transformer.transform(leg.turn_data.center.lon, leg.turn_data.center.lat)
-            all_x.append(x)
-            all_y.append(y)
+    # arcs are not clipped at the page edges (all projected in a single call).
+    if anchors is None:
+        anchors = _project_anchors(flight_plan, flight_plan_data, _transformer_for_projection(map_info))
+    all_x, all_y = anchors.xs[:anchors.route_count], anchors.ys[:anchors.route_count]
 
     route_min_x = min(all_x)
     route_max_x = max(all_x)
@@ -104,7 +101,7 @@ def generate_overview_map_page(flight_plan: FlightPlan, flight_plan_data: Flight
     target_long_px = MAP_HEIGHT * OVERVIEW_FILL_TARGET   # ~870 px
     target_short_px = MAP_WIDTH * OVERVIEW_FILL_TARGET   # ~653 px
 
-    zoom_levels = sorted(z.zoom for z in map_info.zoom_info)
+    zoom_levels = _zoom_levels(map_info)
     selected_zoom = zoom_levels[-1]
     selected_scale = 1.0
 
@@ -159,79 +156,43 @@ def generate_overview_map_page(flight_plan: FlightPlan, flight_plan_data: Flight
         new_w = int(composite.width * scale_factor)
         new_h = int(composite.height * scale_factor)
         logger.info(f"Scaling composite {composite.width}×{composite.height} → {new_w}×{new_h}")
-        composite = composite.resize((new_w, new_h), Image.Resampling.LANCZOS)
+        composite = _scale_composite(composite, (new_w, new_h))
 
-    # ── Step 7: Rotate ───────────────────────────────────────────────────────
+    # ── Step 7: Build the projection → page affine ───────────────────────────
+    # The rotation center first lands on the page center, then everything is
+    # shifted so the route centre lands on the page center.
     center_x = composite.width // 2
     center_y = composite.height // 2
     scaled_composite_size = (composite.width, composite.height)
+    half_w = MAP_WIDTH // 2
+    half_h = MAP_HEIGHT // 2
 
-    rotated = _rotate_image(composite, rotation_angle, (center_x, center_y))
-    logger.info(f"Rotated image size: {rotated.width}×{rotated.height}")
-
-    # ── Step 8: Build coord_to_pixel mapping ─────────────────────────────────
-    def coord_to_pixel(lat: float, lon: float) -> Tuple[float, float]:
-        """Convert geographic coordinates to pixel position on the rotated image."""
-        x_proj, y_proj = transformer.transform(lon, lat)
-        return _tm_to_pixel_on_rotated_image(
-            x_proj, y_proj,
-            bbox_tm, map_info, zoom,
-            rotation_angle, (center_x, center_y),
-            scaled_composite_size, rotated.size,
-            scale_factor,
-        )
-
-    # ── Step 9: Annotate legs and waypoints on the rotated image ────────────
-    annotate_overview_map(rotated, flight_plan, flight_plan_data, coord_to_pixel)
-
-    # ── Step 10: Compute route centre on rotated image for cropping ──────────
-    route_center_px, route_center_py = _tm_to_pixel_on_rotated_image(
-        route_center_x, route_center_y,
+    affine = _build_tm_to_rotated_affine(
         bbox_tm, map_info, zoom,
         rotation_angle, (center_x, center_y),
-        scaled_composite_size, rotated.size,
+        scaled_composite_size, (MAP_WIDTH, MAP_HEIGHT),
         scale_factor,
     )
+    (m_a, m_b, m_c), (m_d, m_e, m_f) = affine.tolist()
+    left = int(m_a * route_center_x + m_b * route_center_y + m_c - half_w)
+    top = int(m_d * route_center_x + m_e * route_center_y + m_f - half_h)
+    affine[:, 2] -= (left, top)
+
+    # ── Step 8: Rotate straight into the MAP_WIDTH × MAP_HEIGHT page ─────────
+    # Areas outside the tile grid are left black.
+    cropped = _rotate_into_frame(
+        composite, rotation_angle, (center_x, center_y),
+        (MAP_WIDTH / 2 - left, MAP_HEIGHT / 2 - top), (MAP_WIDTH, MAP_HEIGHT),
+    )
 
-    # ── Step 11: Crop to MAP_WIDTH × MAP_HEIGHT centered on route centre ─────
-    half_w = MAP_WIDTH // 2
-    half_h = MAP_HEIGHT // 2
+    # ── Step 9: Build coord_to_pixel mapping ─────────────────────────────────
+    # The route points projected in step 1 are mapped to the page in one batch.
+    coord_to_pixel = _coord_to_pixel_mapper(anchors, affine)
+
+    # ── Step 10: Annotate legs and waypoints on the page ─────────────────────
+    annotate_overview_map(cropped, flight_plan, flight_plan_data, coord_to_pixel)
 
-    left = int(route_center_px - half_w)
-    top = int(route_center_py - half_h)
-    right = left + MAP_WIDTH
-    bottom = top + MAP_HEIGHT
-
-    # Shift inward if the box extends beyond image bounds.
-    if left < 0:
-        right -= left
-        left = 0
-    if top < 0:
-        bottom -= top
-        top = 0
-    if right > rotated.width:
-        left -= right - rotated.width
-        right = rotated.width
-    if bottom > rotated.height:
-        top -= bottom - rotated.height
-        bottom = rotated.height
-    left = max(0, left)
-    top = max(0, top)
-
-    cropped = rotated.crop((left, top, right, bottom))
-
-    # Pad with black if crop is smaller than target (near tile grid edges).
-    if cropped.width < MAP_WIDTH or cropped.height < MAP_HEIGHT:
-        logger.warning(
-            f"Cropped overview image smaller than target "
-            f"({cropped.width}×{cropped.height}), padding."
-        )
-        padded = Image.new('RGB', (MAP_WIDTH, MAP_HEIGHT), 'black')
-        padded.paste(cropped, ((MAP_WIDTH - cropped.width) // 2,
-                               (MAP_HEIGHT - cropped.height) // 2))
-        cropped = padded
-
-    # ── Step 12: Draw north arrow and route summary on the cropped image ─────
+    # ── Step 11: Draw north arrow and route summary on the cropped image ─────
     if cropped.mode != 'RGBA':
         cropped = cropped.convert('RGBA')
 
@@ -246,8 +207,8 @@ def generate_overview_map_page(flight_plan: FlightPlan, flight_plan_data: Flight
 
     cropped = Image.alpha_composite(cropped, overlay)
 
-    # ── Step 13: Encode and return ───────────────────────────────────────────
+    # ── Step 12: Encode and return ───────────────────────────────────────────
     out = io.BytesIO()
-    cropped.convert('RGB').save(out, format='PNG')
+    cropped.convert('RGB').save(out, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
     logger.info(f"Overview map page generated: {out.tell()} bytes")
     return out.getvalue()
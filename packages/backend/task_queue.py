@@ -144,7 +144,7 @@ class TaskQueue:
                 with self._lock:
                     if task_id in self._tasks:
                         self._tasks[task_id].progress_message = message
-                        logger.debug(f"Task {task_id} progress: {message}")
+                        logger.debug("Task %s progress: %s", task_id, message)
             
             # Generate kneeboard
             if task_state.output == "zip":
@@ -79,6 +79,14 @@ class TestPydanticModels:
         with pytest.raises(Exception):
             make_point(exitTimeSec=86400)
 
+    def test_models_are_frozen(self):
+        """Validated plans are read-only, so derived data can be cached safely."""
+        plan = make_plan([make_point(), make_point(lon=37.0)])
+        with pytest.raises(Exception):
+            plan.points[0].lat = 35.0
+        with pytest.raises(Exception):
+            plan.bankAngle = 45.0
+
 
 # ── 2. get_effective_exit_time helper ───────────────────────────────────
 
@@ -4,8 +4,27 @@ Unit tests for the FlightPlanData class.
 Tests cover various wind scenarios, declination variations, and edge cases.
 """
 
+import math
+import numpy as np
 import pytest
-from flight_plan import FlightPlan, FlightPlanTurnPoint, FlightPlanData
+from flight_plan import (
+    FlightPlan,
+    FlightPlanTurnPoint,
+    FlightPlanData,
+    LegData,
+    Point,
+    _create_transformer,
+    _load_theatre_config,
+    calculate_bearing,
+    calculate_distance,
+    _PointCache,
+    _point_caches,
+    _bearing_cached,
+    _bearing_and_distance,
+    _points_to_soa,
+    _great_circle_legs,
+    _wind_triangle_kernel,
+)
 
 
 def create_turnpoint(lat, lon, tas=400, alt=3000, fuelFlow=6000, windSpeed=20, windDir=270):
@@ -242,6 +261,16 @@ class TestFlightPlanDataDeclination:
             assert fp_data.turnpointData[i].etaSec > fp_data.turnpointData[i-1].etaSec
             assert fp_data.turnpointData[i].efr < fp_data.turnpointData[i-1].efr
     
+    def test_course_stays_below_360(self):
+        """A due-north leg with a tiny west declination has a course of 0, not 360."""
+        points_data = [
+            {"lat": 34.0, "lon": 36.0},
+            {"lat": 35.0, "lon": 36.0},
+        ]
+        plan = create_flight_plan(points_data, declination=-1e-15)
+        course = FlightPlanData(plan).legData[0].course
+        assert 0 <= course < 360
+    
     def test_west_declination(self):
         """Test a flight plan with west (negative) declination."""
         points_data = [
@@ -645,3 +674,120 @@ class TestLeg0GroundAlt:
         level_ete = round(leg1.distanceNm / 400 * 3600)
         assert leg1.eteSec == level_ete
 
+
+class TestGreatCircleLegs:
+    """The vectorized leg pass must agree with the scalar helpers."""
+
+    def test_matches_scalar_bearing_and_distance(self):
+        points_data = [
+            {"lat": 34.0, "lon": 36.0},
+            {"lat": 34.5, "lon": 36.8},
+            {"lat": 33.2, "lon": 37.1},
+            {"lat": 33.2, "lon": 35.9},
+        ]
+        plan = create_flight_plan(points_data)
+        soa = _points_to_soa(plan)
+        bearings, distances = _great_circle_legs(soa['lat'], soa['lon'])
+
+        assert len(bearings) == len(distances) == len(points_data) - 1
+        for i in range(len(points_data) - 1):
+            p1 = Point(points_data[i]["lat"], points_data[i]["lon"])
+            p2 = Point(points_data[i + 1]["lat"], points_data[i + 1]["lon"])
+            assert bearings[i] == pytest.approx(calculate_bearing(p1, p2), abs=1e-9)
+            assert distances[i] == pytest.approx(calculate_distance(p1, p2), rel=1e-12)
+
+    def test_cached_helpers_match_scalar(self):
+        p1, p2 = Point(34.0, 36.0), Point(35.2, 34.7)
+        c1 = _PointCache.from_lat_lon(p1.lat, p1.lon)
+        c2 = _PointCache.from_lat_lon(p2.lat, p2.lon)
+        assert _bearing_cached(c1, c2) == pytest.approx(calculate_bearing(p1, p2), abs=1e-12)
+        bearing, distance = _bearing_and_distance(c1, c2)
+        assert bearing == pytest.approx(calculate_bearing(p1, p2), abs=1e-12)
+        assert distance == pytest.approx(calculate_distance(p1, p2), rel=1e-12)
+
+    def test_vectorized_point_caches(self):
+        lat = np.array([34.0, 35.2, -12.5])
+        lon = np.array([36.0, 34.7, 170.0])
+        for cache, la, lo in zip(_point_caches(lat, lon), lat, lon):
+            expected = _PointCache.from_lat_lon(la, lo)
+            assert cache.lat_r == pytest.approx(expected.lat_r, abs=1e-15)
+            assert cache.lon_r == pytest.approx(expected.lon_r, abs=1e-15)
+            assert cache.sin_lat == pytest.approx(expected.sin_lat, abs=1e-15)
+            assert cache.cos_lat == pytest.approx(expected.cos_lat, abs=1e-15)
+
+    def test_soa_columns(self):
+        plan = create_flight_plan([
+            {"lat": 34.0, "lon": 36.0, "tas": 420, "windDir": 90},
+            {"lat": 35.0, "lon": 37.0, "fuelFlow": 5000, "windSpeed": 15},
+        ])
+        soa = _points_to_soa(plan)
+        assert soa['tas'].tolist() == [420, 400]
+        assert soa['fuelFlow'].tolist() == [6000, 5000]
+        assert soa['windSpeed'].tolist() == [20, 15]
+        assert soa['windDir'].tolist() == [90, 270]
+
+    def test_as_soa_is_cached_and_read_only(self):
+        plan = create_flight_plan([
+            {"lat": 34.0, "lon": 36.0},
+            {"lat": 35.0, "lon": 37.0},
+        ])
+        soa = plan.as_soa()
+        assert plan.as_soa() is soa
+        assert soa['lat'].tolist() == [34.0, 35.0]
+        with pytest.raises(ValueError):
+            soa['lat'][0] = 0.0
+        # The cache is not part of the model equality
+        assert plan == FlightPlan(**plan.model_dump())
+
+    def test_model_copy_does_not_share_derived_values(self):
+        """A copy with updated points must not reuse the original's SoA arrays."""
+        import copy
+        plan = create_flight_plan([
+            {"lat": 34.0, "lon": 36.0},
+            {"lat": 35.0, "lon": 37.0},
+        ])
+        course = FlightPlanData(plan).legData[0].course
+        reversed_plan = plan.model_copy(update={"points": plan.points[::-1]})
+        assert reversed_plan.as_soa()['lon'].tolist() == [37.0, 36.0]
+        assert FlightPlanData(reversed_plan).legData[0].course == pytest.approx((course + 180) % 360, abs=1.5)
+        for copied in (plan.model_copy(deep=True), copy.copy(plan), copy.deepcopy(plan)):
+            assert copied.as_soa() is not plan.as_soa()
+            assert copied.as_soa()['lon'].tolist() == [36.0, 37.0]
+
+    def test_precomputed_inputs_match_standalone_leg(self):
+        """FlightPlanData's batched inputs give the same legs as a standalone LegData."""
+        plan = create_flight_plan([
+            {"lat": 34.0, "lon": 36.0},
+            {"lat": 34.5, "lon": 36.8},
+            {"lat": 33.2, "lon": 37.1},
+        ])
+        fp_data = FlightPlanData(plan)
+        config = _load_theatre_config(plan.theatre)
+        transformer = _create_transformer(config)
+        navigation_mode = config.get("navigation_mode", "geographic")
+
+        leg = LegData(plan, 1, 2, fp_data.legData[0].heading, transformer, navigation_mode)
+        batched = fp_data.legData[1]
+        assert leg.course == pytest.approx(batched.course, abs=1e-6)
+        assert leg.distanceNm == pytest.approx(batched.distanceNm, rel=1e-9)
+        assert leg.straigthening_point.lat == pytest.approx(batched.straigthening_point.lat, abs=1e-9)
+        assert leg.straigthening_point.lon == pytest.approx(batched.straigthening_point.lon, abs=1e-9)
+
+
+class TestWindTriangleKernel:
+    """The compiled wind triangle should match the plain formula."""
+
+    def test_matches_formula(self):
+        tas, wind_speed, wind_dir, course = 400.0, 30.0, 250.0, 45.0
+        wind_angle = math.radians(wind_dir + 180) - math.radians(course)
+        expected_gs = tas + wind_speed * math.cos(wind_angle)
+        expected_heading = (course - math.degrees(math.asin(wind_speed * math.sin(wind_angle) / expected_gs)) + 360) % 360
+
+        gs, heading = _wind_triangle_kernel(tas, wind_speed, math.radians(wind_dir + 180), course)
+
+        assert gs == pytest.approx(expected_gs, rel=1e-12)
+        assert heading == pytest.approx(expected_heading, abs=1e-9)
+
+    def test_crosswind_stronger_than_ground_speed_raises(self):
+        with pytest.raises(ValueError):
+            _wind_triangle_kernel(50.0, 100.0, math.radians(90.0 + 180), 0.0)
@@ -5,13 +5,50 @@ Tests cover validation, error conditions, and PNG generation.
 """
 
 import io
+import math
 import zipfile
 import pytest
 import os
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
 from pydantic import ValidationError
-from flight_plan import FlightPlan, FlightPlanTurnPoint
+import kneeboard
+from flight_plan import FlightPlan, FlightPlanTurnPoint, FlightPlanData, _create_transformer, _load_theatre_config
 from kneeboard import generate_kneeboard_single_png, generate_kneeboard_zip, TILES_DIR, TILES_INFO_PATH
+from kneeboard import (
+    MapInfo,
+    MAP_HEIGHT,
+    LEG_HEIGHT_TARGET,
+    TILE_SIZE,
+    _get_map_info,
+    _transformer_for_projection,
+    _grid_corners_tm,
+    _zoom_level_info,
+    _get_resolution_for_zoom,
+    _zoom_levels,
+    _select_zoom_level,
+    _build_zoom_tables,
+    _open_rgb,
+    _bbox_tm_to_tile_bounds,
+    _build_tm_to_rotated_affine,
+    _coord_to_pixel_mapper,
+    _project_anchors,
+    _tm_to_pixel_on_rotated_image,
+    _scale_composite,
+    _frame_source_box,
+    _rotate_into_frame,
+    _tiles_under_footprint,
+)
+from map_annotations import draw_threat_rings
+
+
+@pytest.fixture(autouse=True)
+def fresh_leg_map_cache(monkeypatch):
+    """Give each test an empty leg map cache, so no page is served from an earlier test."""
+    monkeypatch.setattr(kneeboard, "_leg_map_cache", OrderedDict())
 
 
 # Test fixtures for valid flight plan data
@@ -556,7 +593,6 @@ def test_zip_contains_overview_page(mock_tiles_info, valid_flight_plan):
         # Should be a valid 768x1024 PNG
         overview_data = zf.read("1overview.png")
         assert overview_data[:8] == b'\x89PNG\r\n\x1a\n'
-        from PIL import Image
         img = Image.open(io.BytesIO(overview_data))
         assert img.width == 768
         assert img.height == 1024
@@ -564,6 +600,445 @@ def test_zip_contains_overview_page(mock_tiles_info, valid_flight_plan):
         assert names[2] == "leg_01.png"
 
 
+def test_zip_leg_maps_from_worker_pool_match_serial(mock_tiles_info, valid_flight_plan, monkeypatch):
+    """Leg maps rendered by the worker processes should be identical to serial ones, in leg order."""
+    flight_plan = FlightPlan(**valid_flight_plan)
+    monkeypatch.setattr(kneeboard, "LEG_MAP_CACHE_SIZE", 0)
+    monkeypatch.setattr(kneeboard, "LEG_MAP_WORKERS", 1)
+    serial = zipfile.ZipFile(io.BytesIO(generate_kneeboard_zip(flight_plan)))
+    monkeypatch.setattr(kneeboard, "LEG_MAP_WORKERS", 2)
+    progress = []
+    try:
+        pooled = zipfile.ZipFile(io.BytesIO(generate_kneeboard_zip(flight_plan, progress.append)))
+        assert kneeboard._leg_map_pool is not None
+    finally:
+        kneeboard._reset_leg_map_pool()
+    assert pooled.namelist() == serial.namelist()
+    for name in serial.namelist():
+        assert pooled.read(name) == serial.read(name)
+    assert progress[0] == "Generating 2 leg maps in parallel..."
+    assert progress[1:3] == ["Leg 1/2 done", "Leg 2/2 done"]
+
+
+def test_leg_maps_are_cached_per_plan_and_details(mock_tiles_info, valid_flight_plan, monkeypatch):
+    """Re-rendering the same plan should not render the legs again; any change to the plan should."""
+    monkeypatch.setattr(kneeboard, "LEG_MAP_WORKERS", 1)
+    rendered = []
+    generate_leg_map = kneeboard.generate_leg_map
+    def counting_generate_leg_map(flight_plan, flight_plan_data, leg_index, *args):
+        rendered.append(leg_index)
+        return generate_leg_map(flight_plan, flight_plan_data, leg_index, *args)
+    monkeypatch.setattr(kneeboard, "generate_leg_map", counting_generate_leg_map)
+
+    flight_plan = FlightPlan(**valid_flight_plan)
+    first = zipfile.ZipFile(io.BytesIO(generate_kneeboard_zip(flight_plan)))
+    assert rendered == [0, 1]
+    again = zipfile.ZipFile(io.BytesIO(generate_kneeboard_zip(FlightPlan(**valid_flight_plan))))
+    assert again.read("leg_01.png") == first.read("leg_01.png")
+    # A cache hit does not compute the plan data again
+    def no_flight_plan_data(flight_plan):
+        raise AssertionError("FlightPlanData built on a cache hit")
+    monkeypatch.setattr(kneeboard, "FlightPlanData", no_flight_plan_data)
+    assert generate_kneeboard_single_png(flight_plan, 1) == first.read("leg_02.png")
+    monkeypatch.setattr(kneeboard, "FlightPlanData", FlightPlanData)
+    assert rendered == [0, 1]
+
+    generate_kneeboard_zip(flight_plan.model_copy(update={"declination": flight_plan.declination + 1}))
+    generate_kneeboard_single_png(flight_plan, 1, {"something"})
+    assert rendered == [0, 1, 0, 1, 1]
+
+
+def test_leg_map_workers_default_and_override(monkeypatch):
+    """Workers default to the available CPUs (capped) and can be set from the environment."""
+    monkeypatch.delenv("LEG_MAP_WORKERS", raising=False)
+    monkeypatch.setattr(kneeboard, "_available_cpus", lambda: 64)
+    assert kneeboard._leg_map_workers() == kneeboard.MAX_LEG_MAP_WORKERS
+    monkeypatch.setattr(kneeboard, "_available_cpus", lambda: 1)
+    assert kneeboard._leg_map_workers() == 1
+    monkeypatch.setenv("LEG_MAP_WORKERS", "6")
+    assert kneeboard._leg_map_workers() == 6
+    monkeypatch.setenv("LEG_MAP_WORKERS", "many")
+    assert kneeboard._leg_map_workers() == 1
+    assert 1 <= kneeboard._available_cpus() <= (os.cpu_count() or 1)
+
+
+def test_transformer_is_shared_across_calls():
+    """Leg map helpers should reuse one cached Transformer per theatre projection."""
+    map_info = _get_map_info("syria")
+    transformer = _transformer_for_projection(map_info)
+    assert _transformer_for_projection(_get_map_info("syria")) is transformer
+    assert _create_transformer(_load_theatre_config("syria")) is transformer
+
+
+def test_shared_transformer_is_safe_across_threads():
+    """Concurrent projections with the shared Transformer should match serial ones."""
+    transformer = _transformer_for_projection(_get_map_info("syria"))
+    points = [(36.0 + i * 0.01, 34.0 + i * 0.005) for i in range(200)]
+    expected = [transformer.transform(lon, lat) for lon, lat in points]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda p: transformer.transform(p[0], p[1]), points))
+    assert results == expected
+
+
+def test_load_all_map_info_fills_the_cache():
+    """Worker start-up should leave every theatre's map info cached with its zoom tables."""
+    kneeboard._load_all_map_info()
+    for theatre in ("syria", "caucasus", "germany"):
+        map_info = kneeboard._get_map_info(theatre)
+        assert map_info._grid_corners_tm is not None
+        assert map_info._resolution_by_zoom
+    assert kneeboard._get_map_info.cache_info().currsize >= 3
+
+
+def test_grid_corners_match_scalar_projection():
+    """The batched grid corner projection should match projecting each corner alone."""
+    map_info = _get_map_info("syria")
+    transformer = _transformer_for_projection(map_info)
+    origin = transformer.transform(map_info.origin_lon, map_info.origin_lat)
+    ref = transformer.transform(map_info.ref_corner_ne_lon, map_info.ref_corner_ne_lat)
+    assert _grid_corners_tm(map_info) == pytest.approx((*origin, *ref))
+    assert _grid_corners_tm(map_info) is _grid_corners_tm(map_info)
+
+
+def test_zoom_lookups_are_memoized():
+    """Zoom level info and resolutions should come from per-MapInfo tables."""
+    map_info = _get_map_info("syria")
+    assert _get_map_info("syria") is map_info
+    z_info = map_info.zoom_info[0]
+    assert _zoom_level_info(map_info, z_info.zoom) is z_info
+    resolution = _get_resolution_for_zoom(map_info, z_info.zoom)
+    assert resolution > 0
+    assert map_info._resolution_by_zoom is not None
+    assert map_info._resolution_by_zoom[z_info.zoom] == resolution
+    assert _zoom_levels(map_info) == tuple(sorted(z.zoom for z in map_info.zoom_info))
+    with pytest.raises(ValueError, match="Zoom level 99 not found"):
+        _zoom_level_info(map_info, 99)
+
+
+@pytest.mark.parametrize("theatre", ["syria", "caucasus", "germany"])
+def test_geometric_zoom_selection_matches_scan(theatre):
+    """The log2 zoom selection should pick the same level as the linear scan."""
+    map_info = _get_map_info(theatre)
+    assert map_info._zoom_is_geometric
+    scan_info = MapInfo.model_validate(map_info.model_dump())
+    _build_zoom_tables(scan_info)
+    scan_info._zoom_is_geometric = False
+    assert map_info._resolution_by_zoom is not None
+    # Include distances sitting exactly on a zoom level boundary
+    boundaries = [res * MAP_HEIGHT * LEG_HEIGHT_TARGET for res in map_info._resolution_by_zoom.values()]
+    for distance in [0.0, 1.0, 500.0, 5e3, 2e4, 1e5, 4e5, 2e6, 1e8] + boundaries:
+        assert _select_zoom_level(map_info, distance) == _select_zoom_level(scan_info, distance)
+
+
+def test_assemble_tiles_places_each_tile(tmp_path, monkeypatch):
+    """Tiles fetched in parallel should land at their grid position in the composite."""
+    map_info = kneeboard._get_map_info("syria")
+    zoom = map_info.zoom_info[0].zoom
+    colors = {(0, 0): (255, 0, 0), (1, 0): (0, 255, 0), (0, 1): (0, 0, 255), (1, 1): (255, 255, 0)}
+    for (tx, ty), color in colors.items():
+        tile_dir = tmp_path / "syria" / str(zoom) / str(tx)
+        tile_dir.mkdir(parents=True, exist_ok=True)
+        Image.new("RGB", (kneeboard.TILE_SIZE, kneeboard.TILE_SIZE), color).save(tile_dir / f"{ty}.png")
+    monkeypatch.setattr(kneeboard, "TILES_DIR", str(tmp_path))
+    monkeypatch.setattr(kneeboard, "_bbox_tm_to_tile_bounds", lambda bbox_tm, map_info, zoom: (0, 0, 1, 1))
+
+    kneeboard._fetch_tile.cache_clear()
+    kneeboard._present_tiles.cache_clear()
+    kneeboard._tile_pack.cache_clear()
+    try:
+        composite = kneeboard._assemble_tiles(map_info, zoom, (0, 0, 0, 0))
+        assert kneeboard._fetch_tile.cache_info().hits == 0
+        # Another assembly over the same tiles is built from the decoded tile cache...
+        again = kneeboard._assemble_tiles(map_info, zoom, (0, 0, 0, 0))
+        assert kneeboard._fetch_tile.cache_info().hits == len(colors)
+        assert kneeboard._present_tiles.cache_info().misses == 1
+        # ...as an independent image: drawing on one leaves the tiles untouched
+        again.paste((1, 2, 3), (0, 0, 10, 10))
+        assert kneeboard._assemble_tiles(map_info, zoom, (0, 0, 0, 0)).getpixel((0, 0)) == colors[(0, 0)]
+    finally:
+        kneeboard._fetch_tile.cache_clear()
+        kneeboard._present_tiles.cache_clear()
+        kneeboard._tile_pack.cache_clear()
+
+    assert composite.size == (2 * kneeboard.TILE_SIZE, 2 * kneeboard.TILE_SIZE)
+    for (tx, ty), color in colors.items():
+        center = (tx * kneeboard.TILE_SIZE + 128, ty * kneeboard.TILE_SIZE + 128)
+        assert composite.getpixel(center) == color
+
+
+def test_assemble_tiles_from_tile_pack(tmp_path, monkeypatch):
+    """A packed zoom level should give the same composite as the individual tiles."""
+    map_info = kneeboard._get_map_info("syria")
+    zoom = map_info.zoom_info[0].zoom
+    rng = np.random.default_rng(0)
+    pack = rng.integers(0, 256, size=(3, 3, kneeboard.TILE_SIZE, kneeboard.TILE_SIZE, 3), dtype=np.uint8)
+    (tmp_path / "syria").mkdir()
+    np.save(tmp_path / "syria" / f"tiles_{zoom}.npy", pack)
+    monkeypatch.setattr(kneeboard, "TILES_DIR", str(tmp_path))
+    monkeypatch.setattr(kneeboard, "_bbox_tm_to_tile_bounds", lambda bbox_tm, map_info, zoom: (1, 0, 2, 1))
+
+    kneeboard._tile_pack.cache_clear()
+    try:
+        composite = np.asarray(kneeboard._assemble_tiles(map_info, zoom, (0, 0, 0, 0)))
+    finally:
+        kneeboard._tile_pack.cache_clear()
+
+    size = kneeboard.TILE_SIZE
+    assert composite.shape == (2 * size, 2 * size, 3)
+    for ty in range(2):
+        for tx in range(2):
+            cell = composite[ty * size:(ty + 1) * size, tx * size:(tx + 1) * size]
+            assert np.array_equal(cell, pack[ty, tx + 1])
+
+
+def test_missing_tiles_are_detected_from_the_directory_scan(tmp_path, monkeypatch):
+    """Tiles absent from the zoom directory scan should fall back without touching the disk."""
+    tile_dir = tmp_path / "syria" / "3" / "5"
+    tile_dir.mkdir(parents=True)
+    Image.new("RGB", (kneeboard.TILE_SIZE, kneeboard.TILE_SIZE), (1, 2, 3)).save(tile_dir / "7.png")
+    (tile_dir / "notes.txt").write_text("not a tile")
+    monkeypatch.setattr(kneeboard, "TILES_DIR", str(tmp_path))
+
+    kneeboard._fetch_tile.cache_clear()
+    kneeboard._present_tiles.cache_clear()
+    try:
+        assert kneeboard._present_tiles("syria", 3) == frozenset({(5, 7)})
+        assert kneeboard._present_tiles("syria", 4) == frozenset()
+        tile = kneeboard._fetch_tile("syria", 3, 5, 7)
+        assert tile is not None and tile.getpixel((0, 0)) == (1, 2, 3)
+        missing = kneeboard._fetch_tile("syria", 3, 5, 8)
+        assert missing is not None
+        assert missing.size == (kneeboard.TILE_SIZE, kneeboard.TILE_SIZE)
+        assert missing is (kneeboard._BLANK_TILE if kneeboard._BLANK_TILE is not None else kneeboard._WHITE_TILE)
+        # Without a blank tile, every missing tile shares the same white tile
+        monkeypatch.setattr(kneeboard, "_BLANK_TILE", None)
+        white = kneeboard._fetch_tile("syria", 3, 5, 9)
+        assert white is kneeboard._fetch_tile("syria", 3, 6, 0)
+        assert white is not None and white.getpixel((0, 0)) == (255, 255, 255)
+    finally:
+        kneeboard._fetch_tile.cache_clear()
+        kneeboard._present_tiles.cache_clear()
+
+
+def test_open_rgb_converts_only_non_rgb_tiles(tmp_path):
+    """RGB tiles are returned as decoded, palette tiles are converted to RGB."""
+    Image.new("RGB", (4, 4), (10, 20, 30)).save(tmp_path / "rgb.png")
+    Image.new("RGB", (4, 4), (10, 20, 30)).convert("P", palette=Image.Palette.ADAPTIVE).save(tmp_path / "palette.png")
+    rgb = _open_rgb(str(tmp_path / "rgb.png"))
+    palette = _open_rgb(str(tmp_path / "palette.png"))
+    assert rgb.mode == "RGB" and rgb.getpixel((0, 0)) == (10, 20, 30)
+    assert palette.mode == "RGB" and palette.getpixel((0, 0)) == (10, 20, 30)
+
+
+def test_tm_to_rotated_affine_matches_step_by_step_chain():
+    """The affine matrix should reproduce translate → scale → rotate → re-centre."""
+    map_info = _get_map_info("syria")
+    zoom = map_info.zoom_info[2].zoom
+    origin_x, origin_y, _, _ = _grid_corners_tm(map_info)
+    resolution = _get_resolution_for_zoom(map_info, zoom)
+    bbox_tm = (origin_x + 2e5, origin_y - 3e5, origin_x + 2.5e5, origin_y - 2.5e5)
+    scale_factor, angle, center, rotated_size = 0.8, 37.0, (600, 500), (1500, 1400)
+
+    m = _build_tm_to_rotated_affine(bbox_tm, map_info, zoom, angle, center, (1200, 1000), rotated_size, scale_factor)
+
+    min_tile_x, min_tile_y, _, _ = _bbox_tm_to_tile_bounds(bbox_tm, map_info, zoom)
+    x_tm, y_tm = origin_x + 2.2e5, origin_y - 2.7e5
+    px = (x_tm - origin_x) / (resolution / scale_factor) - min_tile_x * TILE_SIZE * scale_factor
+    py = (origin_y - y_tm) / (resolution / scale_factor) - min_tile_y * TILE_SIZE * scale_factor
+    a = -math.radians(angle)
+    rel_x, rel_y = px - center[0], py - center[1]
+    expected = (
+        rel_x * math.cos(a) - rel_y * math.sin(a) + rotated_size[0] / 2,
+        rel_x * math.sin(a) + rel_y * math.cos(a) + rotated_size[1] / 2,
+    )
+    assert tuple(m @ [x_tm, y_tm, 1.0]) == pytest.approx(expected, abs=1e-6)
+
+
+def test_coord_to_pixel_mapper_matches_per_point_projection(valid_flight_plan):
+    """Batch-projected anchors and per-point fallbacks should give the same pixels."""
+    flight_plan = FlightPlan(**valid_flight_plan)
+    transformer = _transformer_for_projection(_get_map_info(flight_plan.theatre))
+    flight_plan_data = FlightPlanData(flight_plan)
+    anchors = _project_anchors(flight_plan, flight_plan_data, transformer)
+    assert len(anchors.xs) >= len(flight_plan.points) + len(flight_plan_data.legData)
+    affine = np.array([[0.01, -0.002, 300.0], [0.003, -0.01, 4000.0]])
+    coord_to_pixel = _coord_to_pixel_mapper(anchors, affine)
+
+    (a, b, c), (d, e, f) = affine.tolist()
+    straight = flight_plan_data.legData[0].straigthening_point
+    for lat, lon in [(pt.lat, pt.lon) for pt in flight_plan.points] + [(straight.lat, straight.lon), (35.25, 36.75)]:
+        x, y = transformer.transform(lon, lat)
+        assert anchors.xy(lat, lon) == (x, y)
+        assert coord_to_pixel(lat, lon) == (a * x + b * y + c, d * x + e * y + f)
+
+
+def test_project_anchors_includes_plan_objects_after_the_route(valid_flight_plan):
+    """Plan objects should be projected with the route, without changing the route anchors."""
+    plan = dict(valid_flight_plan)
+    plan["markers"] = [{"id": "m1", "type": "sam_site", "lat": 33.1, "lon": 38.2}]
+    plan["libraryRefs"] = [{"uuid": "lib1"}, {"uuid": "missing"}]
+    plan["librarySnapshot"] = [{"id": "lib1", "type": "aaa", "lat": 36.4, "lon": 35.9}]
+    flight_plan = FlightPlan(**plan)
+    transformer = _transformer_for_projection(_get_map_info(flight_plan.theatre))
+
+    anchors = _project_anchors(flight_plan, FlightPlanData(flight_plan), transformer)
+    route_only = FlightPlan(**valid_flight_plan)
+    route = _project_anchors(route_only, FlightPlanData(route_only), transformer)
+
+    assert anchors.route_count == route.route_count == len(route.xs)
+    assert anchors.xs[:anchors.route_count] == route.xs
+    assert anchors.ys[:anchors.route_count] == route.ys
+    assert len(anchors.xs) == anchors.route_count + 2
+    for lat, lon in [(33.1, 38.2), (36.4, 35.9)]:
+        assert anchors.index[(lat, lon)] >= anchors.route_count
+        assert anchors.xy(lat, lon) == transformer.transform(lon, lat)
+
+
+def test_threat_rings_batched_projection_matches_per_point(valid_flight_plan):
+    """Rings projected in one batch should be drawn exactly like per-point projected rings."""
+    plan = dict(valid_flight_plan)
+    plan["markers"] = [{"id": "m1", "type": "sam_site", "lat": 35.2, "lon": 36.3, "range": 12.0}]
+    flight_plan = FlightPlan(**plan)
+    transformer = _transformer_for_projection(_get_map_info(flight_plan.theatre))
+    anchors = _project_anchors(flight_plan, FlightPlanData(flight_plan), transformer)
+    x, y = anchors.xy(35.2, 36.3)
+    affine = np.array([[0.01, 0.0, 400.0 - 0.01 * x], [0.0, -0.01, 400.0 + 0.01 * y]])
+    coord_to_pixel = _coord_to_pixel_mapper(anchors, affine)
+    assert hasattr(coord_to_pixel, "many")
+
+    images = []
+    for mapper in (coord_to_pixel, lambda lat, lon: coord_to_pixel(lat, lon)):
+        image = Image.new("RGBA", (800, 800), (0, 0, 0, 0))
+        draw_threat_rings(ImageDraw.Draw(image), image, flight_plan, mapper)
+        images.append(np.asarray(image))
+    assert images[0].any()
+    assert np.array_equal(images[0], images[1])
+
+
+def test_leg_map_straight_part_is_vertical(valid_flight_plan, monkeypatch):
+    """The straight part of each leg should land on a single pixel column, pointing up."""
+    flight_plan = FlightPlan(**valid_flight_plan)
+    flight_plan_data = FlightPlanData(flight_plan)
+    mappers = []
+    monkeypatch.setattr(kneeboard, "annotate_map", lambda image, fp, fpd, leg, coord_to_pixel: mappers.append(coord_to_pixel))
+
+    for leg_index, leg in enumerate(flight_plan_data.legData):
+        kneeboard.generate_leg_map(flight_plan, flight_plan_data, leg_index)
+        dest = flight_plan.points[leg_index + 1]
+        straight_x, straight_y = mappers[-1](leg.straigthening_point.lat, leg.straigthening_point.lon)
+        dest_x, dest_y = mappers[-1](dest.lat, dest.lon)
+        # An angle error of 0.005 rad would already be several pixels over the leg
+        assert abs(dest_x - straight_x) < 0.05
+        assert dest_y < straight_y
+
+
+def test_tm_to_pixel_on_rotated_image_accepts_arrays():
+    """Array input should give the same pixels as converting each point alone."""
+    map_info = _get_map_info("syria")
+    zoom = map_info.zoom_info[2].zoom
+    args = ((-1000.0, 3.9e6, 25000.0, 3.93e6), map_info, zoom, 27.5, (400, 300), (800, 600), (768, 1024), 1.3)
+    xs = np.array([[-1000.0, 0.0], [12345.6, 25000.0]])
+    ys = np.array([[3.9e6, 3.91e6], [3.925e6, 3.93e6]])
+
+    px, py = _tm_to_pixel_on_rotated_image(xs, ys, *args)
+
+    assert isinstance(px, np.ndarray) and isinstance(py, np.ndarray)
+    assert px.shape == py.shape == xs.shape
+    for index in np.ndindex(xs.shape):
+        x, y = _tm_to_pixel_on_rotated_image(float(xs[index]), float(ys[index]), *args)
+        assert isinstance(x, float)
+        assert (px[index], py[index]) == (x, y)
+
+
+@pytest.mark.parametrize("scale", [0.3, 0.6, 0.95, 1.4])
+def test_scale_composite_stays_close_to_lanczos(scale):
+    """The faster composite scaling should look like the LANCZOS resize it replaces."""
+    rng = np.random.default_rng(0)
+    # Smooth map-like content: blurred noise
+    image = Image.fromarray(rng.integers(0, 256, (512, 640, 3), dtype=np.uint8)).filter(ImageFilter.GaussianBlur(4))
+    size = (int(image.width * scale), int(image.height * scale))
+
+    result = _scale_composite(image, size)
+    expected = image.resize(size, Image.Resampling.LANCZOS)
+
+    assert result.size == size
+    diff = np.abs(np.asarray(result, dtype=int) - np.asarray(expected, dtype=int))
+    assert np.mean(diff) < 1.0
+
+
+@pytest.mark.parametrize("scale, angle", [(0.81, 49.36), (0.6, 3.0), (1.0, 100.0), (1.3, 210.5)])
+def test_scaling_only_the_sampled_region_matches_full_scaling(scale, angle):
+    """Scaling and rotating the region under the page should give the page of the whole composite."""
+    rng = np.random.default_rng(1)
+    composite = Image.fromarray(rng.integers(0, 256, (700, 760, 3), dtype=np.uint8))
+    scaled_size = (int(composite.width * scale), int(composite.height * scale))
+    center = (scaled_size[0] // 2, scaled_size[1] // 2)
+    frame_center, size = (170.0, 260.0), (300, 400)
+
+    full = _rotate_into_frame(_scale_composite(composite, scaled_size), angle, center, frame_center, size)
+
+    left, top, right, bottom = _frame_source_box(angle, center, frame_center, size, scaled_size)
+    sx, sy = composite.width / scaled_size[0], composite.height / scaled_size[1]
+    region = _scale_composite(composite, (right - left, bottom - top), box=(left * sx, top * sy, right * sx, bottom * sy))
+    page = _rotate_into_frame(region, angle, (center[0] - left, center[1] - top), frame_center, size)
+
+    assert (right - left) * (bottom - top) < scaled_size[0] * scaled_size[1]
+    # Same pixels up to the rounding of the filter positions in the region
+    diff = np.abs(np.asarray(page, dtype=int) - np.asarray(full, dtype=int))
+    assert diff.max() <= 2
+    assert diff.mean() < 0.1
+
+
+@pytest.mark.parametrize("scale", [0.8, 0.93, 1.0])
+def test_scaling_during_rotation_matches_scaling_first(scale):
+    """Scaling a composite as part of its rotation should give the page of scaling it first."""
+    rng = np.random.default_rng(2)
+    composite = Image.fromarray(rng.integers(0, 256, (700, 760, 3), dtype=np.uint8)).filter(ImageFilter.GaussianBlur(3))
+    scaled_size = (int(composite.width * scale), int(composite.height * scale))
+    center = (scaled_size[0] // 2, scaled_size[1] // 2)
+    frame_center, size, angle = (170.0, 260.0), (300, 400), 37.0
+
+    expected = _rotate_into_frame(_scale_composite(composite, scaled_size), angle, center, frame_center, size)
+    source_scale = (composite.width / scaled_size[0], composite.height / scaled_size[1])
+    page = _rotate_into_frame(composite, angle, center, frame_center, size, source_scale=source_scale)
+
+    diff = np.abs(np.asarray(page, dtype=int) - np.asarray(expected, dtype=int))
+    assert np.mean(diff) < 1.0
+
+
+def test_tiles_under_footprint_skips_cells_outside_a_rotated_page():
+    """Only tiles overlapping the footprint polygon (not just its bounding box) are kept."""
+    bounds = (10, 20, 12, 22)  # 3x3 tiles of 256 px
+    # Diamond around the center cell: its bounding box touches every cell, the corner cells stay outside
+    diamond = [(384, 200), (568, 384), (384, 568), (200, 384)]
+    plus = {(11, 21), (10, 21), (12, 21), (11, 20), (11, 22)}
+    assert _tiles_under_footprint(diamond, bounds, 0) == plus
+    # The margin grows the footprint into the corner cells
+    assert _tiles_under_footprint(diamond, bounds, 60) == {(tx, ty) for tx in range(10, 13) for ty in range(20, 23)}
+    # Axis-aligned footprint inside the top-left 2x2 cells
+    square = [(10, 10), (300, 10), (300, 300), (10, 300)]
+    assert _tiles_under_footprint(square, bounds, 0) == {(10, 20), (11, 20), (10, 21), (11, 21)}
+
+
+@pytest.mark.parametrize("resample", ["NEAREST", "BILINEAR", "BICUBIC"])
+def test_rotate_into_frame_matches_rotate_then_crop(resample):
+    """Sampling straight into the output frame should equal rotate(expand=True) + crop."""
+    rng = np.random.default_rng(0)
+    image = Image.fromarray(rng.integers(0, 256, (300, 400, 3), dtype=np.uint8))
+    angle, center = 33.0, (200, 150)
+    resample = Image.Resampling[resample]
+    rotated = image.rotate(angle, center=center, expand=True, fillcolor='black', resample=resample)
+    # PIL places the rotation center at the center of the expanded image
+    left, top = 60, 40
+    expected = rotated.crop((left, top, left + 200, top + 250))
+
+    result = _rotate_into_frame(image, angle, center, (rotated.width / 2 - left, rotated.height / 2 - top), (200, 250), resample)
+
+    diff = np.abs(np.asarray(result, dtype=int) - np.asarray(expected, dtype=int))
+    assert result.size == (200, 250)
+    assert np.mean(diff) < 1.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
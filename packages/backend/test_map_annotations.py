@@ -1,7 +1,7 @@
 """Tests for coordinate formatting in map_annotations."""
 
 from PIL import Image, ImageDraw
-from map_annotations import _format_coord_ddm, draw_comment_strip
+from map_annotations import _format_coord_ddm, draw_comment_strip, _clamp_px, _clamp_segment_px
 
 
 def test_format_lat_north():
@@ -62,3 +62,25 @@ def test_draw_comment_strip_empty_does_nothing():
     draw_comment_strip(draw, "   ", 768, 1024)
     pixels = list(img.getdata())
     assert all(p[3] == 0 for p in pixels)
+
+
+def test_clamp_segment_matches_per_coordinate_clamp():
+    points = [(10.0, 20.0, 700.0, 1000.0), (-5000.0, 3000.0, 1535.0, -1024.0), (2000.0, -2000.0, -768.0, 2047.0)]
+    for x1, y1, x2, y2 in points:
+        assert _clamp_segment_px(x1, y1, x2, y2, 768, 1024) == (
+            _clamp_px(x1, 768), _clamp_px(y1, 1024), _clamp_px(x2, 768), _clamp_px(y2, 1024)
+        )
+
+
+def test_sprite_composite_matches_full_overlay_composite_at_edges():
+    """Compositing a sprite in place should equal compositing it through a full-size overlay."""
+    sprite = Image.new("RGBA", (40, 30), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).rectangle((5, 5, 35, 25), fill=(200, 30, 30, 150))
+    for dest in [(10, 10), (-15, -10), (90, 85), (-50, 200)]:
+        base = Image.new("RGBA", (100, 100), (20, 40, 200, 120))
+        expected = base.copy()
+        full = Image.new("RGBA", base.size, (0, 0, 0, 0))
+        full.paste(sprite, dest)
+        expected.paste(Image.alpha_composite(expected, full))
+        base.alpha_composite(sprite, dest=dest)
+        assert base.tobytes() == expected.tobytes()
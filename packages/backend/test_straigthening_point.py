@@ -298,3 +298,20 @@ class TestStraighteningPoint:
         turn_angle = self.verify_turn_angle(inbound_bearing, cx, cy, sx, sy, turn_direction)
         assert turn_angle < 46, "This should be a 45 degree turn (turn_angle = 45)"
         assert turn_direction == 1, "This should be a left turn (turn_direction = 1)"
+
+
+class TestTransformerCache:
+    """Transformers are built once per projection and reused."""
+
+    def test_same_config_returns_same_transformer(self):
+        assert _create_transformer(dict(SYRIA_CONFIG)) is DEFAULT_TRANSFORMER
+
+    def test_different_meridian_returns_other_transformer(self):
+        other = _create_transformer({"projection": "transverse_mercator", "central_meridian": 33})
+        assert other is not DEFAULT_TRANSFORMER
+
+    def test_unproject_round_trip(self):
+        x, y = _project(DEFAULT_TRANSFORMER, 34.5, 36.2)
+        lat, lon = _unproject(DEFAULT_TRANSFORMER, x, y)
+        assert lat == pytest.approx(34.5, abs=1e-9)
+        assert lon == pytest.approx(36.2, abs=1e-9)
@@ -9,6 +9,7 @@ import io
 import os
 import math
 import logging
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from flight_plan import FlightPlan
 from map_annotations import _format_coord_ddm
@@ -18,6 +19,7 @@ logger = logging.getLogger(__name__)
 # Page dimensions (same as kneeboard map pages)
 PAGE_WIDTH = 768
 PAGE_HEIGHT = 1024
+PNG_COMPRESS_LEVEL = 1  # Same as kneeboard map pages: fast zlib beats smaller files
 
 # Colors
 BLACK = (0, 0, 0, 255)
@@ -45,8 +47,9 @@ ICON_STROKE = 2
 FONTS_DIR = os.path.join(os.path.dirname(__file__), "config", "fonts")
 
 
+@lru_cache(maxsize=8)
 def _load_fixed_font(size: int) -> ImageFont.FreeTypeFont:
-    """Load the fixed-width font at the given size."""
+    """Load the fixed-width font at the given size (parsed once per size)."""
     font_path = os.path.join(FONTS_DIR, "fixed.ttf")
     try:
         return ImageFont.truetype(font_path, size)
@@ -100,23 +103,15 @@ def _draw_waypoint_icon(draw: ImageDraw.ImageDraw, cx: float, cy: float,
         )
 
 
-def generate_waypoint_list_page(flight_plan: FlightPlan) -> bytes:
-    """Generate a 768x1024 PNG image with a waypoint list table.
-
-    Args:
-        flight_plan: The flight plan containing waypoints.
+@lru_cache(maxsize=1)
+def _page_template() -> tuple[Image.Image, float]:
+    """Blank page with the static title drawn, and the y coordinate below the title.
 
-    Returns:
-        PNG image data as bytes.
+    Built once; callers must work on a copy.
     """
     img = Image.new("RGBA", (PAGE_WIDTH, PAGE_HEIGHT), WHITE)
     draw = ImageDraw.Draw(img)
-
     title_font = _load_fixed_font(TITLE_FONT_SIZE)
-    row_font = _load_fixed_font(ROW_FONT_SIZE)
-
-    table_left = MARGIN_LEFT
-    table_right = PAGE_WIDTH - MARGIN_RIGHT
 
     # Draw title
     title = "WAYPOINTS"
@@ -127,6 +122,26 @@ def generate_waypoint_list_page(flight_plan: FlightPlan) -> bytes:
     draw.text((title_x, title_y), title, fill=BLACK, font=title_font)
 
     title_bottom = title_y + (title_bbox[3] - title_bbox[1]) + 4
+    return img, title_bottom
+
+
+def generate_waypoint_list_page(flight_plan: FlightPlan) -> bytes:
+    """Generate a 768x1024 PNG image with a waypoint list table.
+
+    Args:
+        flight_plan: The flight plan containing waypoints.
+
+    Returns:
+        PNG image data as bytes.
+    """
+    template, title_bottom = _page_template()
+    img = template.copy()
+    draw = ImageDraw.Draw(img)
+
+    row_font = _load_fixed_font(ROW_FONT_SIZE)
+
+    table_left = MARGIN_LEFT
+    table_right = PAGE_WIDTH - MARGIN_RIGHT
 
     # Aircraft header line (below title, above separator)
     ac = flight_plan.aircraft
@@ -142,7 +157,7 @@ def generate_waypoint_list_page(flight_plan: FlightPlan) -> bytes:
         aircraft_label = ''
 
     if aircraft_label:
-        header_font = _load_fixed_font(ROW_FONT_SIZE)
+        header_font = row_font
         header_bbox = header_font.getbbox(aircraft_label)
         header_w = header_bbox[2] - header_bbox[0]
         header_x = (PAGE_WIDTH - header_w) / 2
@@ -193,5 +208,5 @@ def generate_waypoint_list_page(flight_plan: FlightPlan) -> bytes:
     # Convert to RGB (kneeboard pages are RGB PNGs) and save
     img_rgb = img.convert("RGB")
     buf = io.BytesIO()
-    img_rgb.save(buf, format="PNG")
+    img_rgb.save(buf, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
     return buf.getvalue()
@@ -77,7 +77,7 @@ export function calculateDistanceM(
   const dLon = lon2Rad - lon1Rad;
   const dLat = lat2Rad - lat1Rad;
   const a = Math.sin(dLat / 2) * Math.sin(dLat / 2) + Math.cos(lat1Rad) * Math.cos(lat2Rad) * Math.sin(dLon / 2) * Math.sin(dLon / 2);
-  const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1-a));
+  const c = 2 * Math.asin(Math.sqrt(Math.min(1, a)));
   return R * c;
 }
 
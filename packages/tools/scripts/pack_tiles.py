@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tile Packer
+
+This script packs the z/x/y.png tiles of a theatre into one raw RGB array per
+zoom level, so the backend can memory-map them instead of decoding PNGs.
+
+Each zoom level is written as tiles_{z}.npy next to the z/ directories, with
+shape (nb_tiles_h, nb_tiles_w, tile_size, tile_size, 3) and dtype uint8.
+Missing tiles are filled with the blank tile (or white), as the backend does.
+
+Usage:
+    python pack_tiles.py <theatre_tiles_dir> <theatre_json> [--zoom-levels ZOOM_LEVELS]
+
+Example:
+    python pack_tiles.py ../../backend/config/static/tiles/syria ../../backend/theatres/syria.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from PIL import Image
+import numpy as np
+
+
+def pack_zoom_level(tiles_dir, z_info, tile_size=256, blank_tile=None):
+    """
+    Pack all the tiles of one zoom level into tiles_{z}.npy.
+
+    Args:
+        tiles_dir: Theatre tiles directory (containing the z/x/y.png tiles)
+        z_info: Zoom level entry from the theatre JSON
+        tile_size: Size of each tile in pixels
+        blank_tile: RGB array used for missing tiles (white if None)
+
+    Returns:
+        Path of the packed file
+    """
+    zoom = z_info["zoom"]
+    shape = (z_info["nb_tiles_h"], z_info["nb_tiles_w"], tile_size, tile_size, 3)
+    pack_path = os.path.join(tiles_dir, f"tiles_{zoom}.npy")
+    # Written to a temporary file first so a running backend never maps a partial pack
+    tmp_path = pack_path + ".tmp"
+    pack = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8, shape=shape)
+
+    missing = 0
+    for y in range(shape[0]):
+        for x in range(shape[1]):
+            tile_path = os.path.join(tiles_dir, str(zoom), str(x), f"{y}.png")
+            if os.path.exists(tile_path):
+                with Image.open(tile_path) as tile:
+                    tile_arr = np.asarray(tile.convert("RGB"))
+            elif blank_tile is not None:
+                missing += 1
+                tile_arr = blank_tile
+            else:
+                missing += 1
+                pack[y, x] = 255
+                continue
+            # Same placement as the backend composite: cropped to the cell, black padding
+            tile_arr = tile_arr[:tile_size, :tile_size]
+            pack[y, x] = 0
+            pack[y, x, : tile_arr.shape[0], : tile_arr.shape[1]] = tile_arr
+
+    pack.flush()
+    del pack
+    os.replace(tmp_path, pack_path)
+    print(
+        f"  Packed zoom level {zoom}: {shape[1]}x{shape[0]} tiles ({missing} missing) -> {pack_path}",
+        file=sys.stderr,
+    )
+    return pack_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack the XYZ tiles of a theatre into memory-mappable arrays",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python pack_tiles.py ../../backend/config/static/tiles/syria ../../backend/theatres/syria.json
+  python pack_tiles.py ./tiles/syria ./syria.json --zoom-levels 5,6,7
+  python pack_tiles.py ./tiles/syria ./syria.json --blank-tile ../../backend/config/blank.png
+        """,
+    )
+
+    parser.add_argument("tiles_directory", help="Theatre tiles directory (containing z/x/y.png)")
+    parser.add_argument("theatre_json", help="Theatre JSON file with the zoom_info of the tiles")
+    parser.add_argument(
+        "--zoom-levels", help="Comma-separated list of zoom levels to pack (default: all)"
+    )
+    parser.add_argument(
+        "--tile-size",
+        type=int,
+        default=256,
+        help="Size of each tile in pixels (default: 256)",
+    )
+    parser.add_argument(
+        "--blank-tile",
+        help="Tile used in place of missing tiles (default: white)",
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.tiles_directory):
+        print(f"Error: Tiles directory '{args.tiles_directory}' not found")
+        sys.exit(1)
+
+    with open(args.theatre_json, "r") as f:
+        zoom_info = json.load(f)["zoom_info"]
+
+    if args.zoom_levels:
+        try:
+            zoom_levels = {int(z.strip()) for z in args.zoom_levels.split(",")}
+        except ValueError:
+            print(
+                "Error: Invalid zoom levels format. Use comma-separated integers (e.g., 0,1,2,3)"
+            )
+            sys.exit(1)
+        zoom_info = [z_info for z_info in zoom_info if z_info["zoom"] in zoom_levels]
+
+    blank_tile = None
+    if args.blank_tile:
+        with Image.open(args.blank_tile) as blank:
+            blank_tile = np.asarray(blank.convert("RGB"))
+
+    for z_info in zoom_info:
+        pack_zoom_level(args.tiles_directory, z_info, args.tile_size, blank_tile)
+
+
+if __name__ == "__main__":
+    main()